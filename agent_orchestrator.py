@@ -3,17 +3,82 @@ Agent Orchestrator - Section 9 of Claude Code Plan
 Handles multi-agent task decomposition and orchestration
 """
 
-from typing import Dict, List, Any, Optional
-from agents import (
-    create_planner_agent,
-    create_file_reader_agent,
-    create_code_analyst_agent,
-    create_report_writer_agent,
-    create_test_agent
-)
-from llm_wrapper import LiteLLMWrapper
-from crewai import Crew, Task
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+from lazy_imports import lazy_import
+from llm_wrapper import LiteLLMWrapper, get_llm_loop
 from decision_engine import get_decision_engine
+from plan_cache import get_plan_cache
+from exact_cache import get_exact_cache
+from semantic_cache import get_semantic_cache
+
+# CrewAI and the agent factories are heavy to import and unused on cache hits
+crewai = lazy_import("crewai")
+agents = lazy_import("agents")
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of concurrent LLM round-trips across the process (provider rate limits)
+LLM_CONCURRENCY = int(os.getenv("MYDESKAI_LLM_CONCURRENCY", "4"))
+
+# Default number of batch requests orchestrated at once by run_batch_async
+BATCH_CONCURRENCY = int(os.getenv("MYDESKAI_BATCH_CONCURRENCY", "8"))
+
+# Decision routing: these complexities / task types go to the multi-agent crew
+MULTI_AGENT_COMPLEXITIES = frozenset({"high", "medium"})
+MULTI_AGENT_TASK_TYPES = frozenset({"complex_search", "analyze_code"})
+
+# Task types whose planner, file reader and code analyst run as independent parallel branches
+FAN_OUT_TASK_TYPES = frozenset({"complex_search", "analyze_code"})
+
+# One process-wide limit: the semaphore is only ever used on the shared LLM loop,
+# so requests running under different event loops (each asyncio.run) share it
+_llm_limit: Optional[asyncio.Semaphore] = None
+_llm_limit_lock = threading.Lock()
+
+
+def _get_llm_limit() -> asyncio.Semaphore:
+    """Get or create the LLM concurrency semaphore."""
+    global _llm_limit
+    if _llm_limit is None:
+        with _llm_limit_lock:
+            if _llm_limit is None:
+                _llm_limit = asyncio.Semaphore(LLM_CONCURRENCY)
+    return _llm_limit
+
+
+@asynccontextmanager
+async def _llm_semaphore() -> AsyncIterator[None]:
+    """Hold one of the LLM_CONCURRENCY slots, acquired on the shared LLM loop."""
+    semaphore = _get_llm_limit()
+    loop = get_llm_loop()
+    if asyncio.get_running_loop() is loop:
+        async with semaphore:
+            yield
+        return
+    
+    acquired = asyncio.run_coroutine_threadsafe(semaphore.acquire(), loop)
+    try:
+        # Shielded so a cancelled caller never leaves an acquire half-done on the LLM loop
+        await asyncio.shield(asyncio.wrap_future(acquired))
+    except asyncio.CancelledError:
+        acquired.add_done_callback(lambda future: _release_if_acquired(future, semaphore, loop))
+        raise
+    try:
+        yield
+    finally:
+        loop.call_soon_threadsafe(semaphore.release)
+
+
+def _release_if_acquired(future: Future, semaphore: asyncio.Semaphore, loop: asyncio.AbstractEventLoop) -> None:
+    """Give back a slot whose caller was cancelled while waiting for it."""
+    if not future.cancelled() and future.exception() is None:
+        loop.call_soon_threadsafe(semaphore.release)
 
 
 class AgentOrchestrator:
@@ -22,8 +87,12 @@ class AgentOrchestrator:
     def __init__(self):
         """Initialize agent orchestrator."""
         self.decision_engine = get_decision_engine()
+        self.plan_cache = get_plan_cache()
+        self.semantic_cache = get_semantic_cache()
+        self.exact_cache = get_exact_cache()
     
-    def orchestrate_task(self, user_request: str, llm: LiteLLMWrapper, model_name: str = "unknown") -> Dict[str, Any]:
+    def orchestrate_task(self, user_request: str, llm: LiteLLMWrapper, model_name: str = "unknown",
+                         run_direct: bool = True) -> Dict[str, Any]:
         """
         Orchestrate a task using multiple agents following Section 9.1 logic.
         
@@ -31,95 +100,475 @@ class AgentOrchestrator:
             user_request: User's request
             llm: LLM wrapper
             model_name: Model name
+            run_direct: Answer direct LLM requests here. When False the
+                orchestration is returned with its "messages" unanswered, and
+                the caller runs them and calls record_outcome.
             
         Returns:
             Orchestration result
         """
         # TASK ANALYSIS
-        decision = self.decision_engine.process_request(user_request)
+        decision = self.decision_engine.process_request_cached(user_request)
         complexity = decision.get("execution_strategy", {}).get("estimated_complexity", "low")
+        logger.debug("Routing request (task_type=%s, complexity=%s)", decision.get("task_type"), complexity)
         
         # Determine if multi-agent is needed
-        if complexity in ["high", "medium"] or decision.get("task_type") in ["complex_search", "analyze_code"]:
+        if complexity in MULTI_AGENT_COMPLEXITIES or decision.get("task_type") in MULTI_AGENT_TASK_TYPES:
             return self._multi_agent_execution(user_request, llm, model_name, decision)
+        
+        orchestration = self._cached_single_agent_execution(user_request, llm, model_name, decision)
+        if run_direct and orchestration["orchestration_type"] == "direct_llm":
+            result = llm.chat(orchestration["messages"])
+            orchestration["result"] = result
+            self.record_outcome(orchestration, success=True, result=result)
+        return orchestration
+    
+    async def aorchestrate_task(self, user_request: str, llm: LiteLLMWrapper, model_name: str = "unknown") -> Dict[str, Any]:
+        """
+        Orchestrate and run a task asynchronously.
+        
+        On the multi-agent path the planner and executor run concurrently and
+        the report writer runs once both have finished.
+        
+        Args:
+            user_request: User's request
+            llm: LLM wrapper
+            model_name: Model name
+            
+        Returns:
+            Orchestration result including the final "result" text
+        """
+        decision = self.decision_engine.process_request_cached(user_request)
+        complexity = decision.get("execution_strategy", {}).get("estimated_complexity", "low")
+        logger.debug("Routing request (task_type=%s, complexity=%s)", decision.get("task_type"), complexity)
+        
+        if complexity in MULTI_AGENT_COMPLEXITIES or decision.get("task_type") in MULTI_AGENT_TASK_TYPES:
+            return await self._amulti_agent_execution(user_request, llm, model_name, decision)
+        
+        orchestration = self._cached_single_agent_execution(user_request, llm, model_name, decision)
+        if orchestration["orchestration_type"] == "direct_llm":
+            async with _llm_semaphore():
+                result = await llm.achat(orchestration["messages"])
+        elif "crew" in orchestration:
+            async with _llm_semaphore():
+                result = await orchestration["crew"].kickoff_async()
+        else:
+            return orchestration
+        
+        orchestration["result"] = result
+        self.record_outcome(orchestration, success=True, result=result)
+        return orchestration
+    
+    async def astream(self, user_request: str, llm: LiteLLMWrapper, model_name: str = "unknown") -> AsyncIterator[str]:
+        """
+        Orchestrate a task and stream the final answer as it is generated.
+        
+        The multi-agent path gathers the planner and work branches as in
+        aorchestrate_task, then streams the report writer's tokens instead of
+        waiting for the whole report. Direct LLM answers stream the same way;
+        cache hits and tool-using single-agent crews yield their full result
+        as one chunk.
+        
+        Args:
+            user_request: User's request
+            llm: LLM wrapper
+            model_name: Model name
+            
+        Yields:
+            Chunks of the final answer text
+        """
+        decision = self.decision_engine.process_request_cached(user_request)
+        complexity = decision.get("execution_strategy", {}).get("estimated_complexity", "low")
+        logger.debug("Streaming request (task_type=%s, complexity=%s)", decision.get("task_type"), complexity)
+        
+        if complexity in MULTI_AGENT_COMPLEXITIES or decision.get("task_type") in MULTI_AGENT_TASK_TYPES:
+            # The plan is stored while gathering; there is nothing left to record
+            _, report_messages = await self._agather_findings(user_request, llm, model_name, decision)
+            async with _llm_semaphore():
+                async for chunk in llm.astream_chat(report_messages):
+                    yield chunk
+            return
+        
+        orchestration = self._cached_single_agent_execution(user_request, llm, model_name, decision)
+        if orchestration["orchestration_type"] == "direct_llm":
+            chunks = []
+            async with _llm_semaphore():
+                async for chunk in llm.astream_chat(orchestration["messages"]):
+                    chunks.append(chunk)
+                    yield chunk
+            result = "".join(chunks)
+        elif "crew" in orchestration:
+            async with _llm_semaphore():
+                result = await orchestration["crew"].kickoff_async()
+            yield str(result)
         else:
-            return self._single_agent_execution(user_request, llm, model_name, decision)
+            yield orchestration["result"]
+            return
+        
+        self.record_outcome(orchestration, success=True, result=result)
+    
+    async def run_batch_async(self, requests: List[str], llm: LiteLLMWrapper, model_name: str = "unknown",
+                              concurrency: int = BATCH_CONCURRENCY) -> List[Any]:
+        """
+        Orchestrate several independent requests concurrently.
+        
+        At most `concurrency` requests are in flight at once (a sliding
+        window: a new request starts as soon as one finishes). LLM
+        round-trips inside them are still bounded by the shared
+        MYDESKAI_LLM_CONCURRENCY semaphore.
+        
+        Args:
+            requests: User requests to run
+            llm: LLM wrapper
+            model_name: Model name
+            concurrency: Maximum number of requests orchestrated at once
+            
+        Returns:
+            Orchestration results in the same order as requests; a request
+            that failed has its exception in its slot instead
+        """
+        window = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run_one(request: str) -> Dict[str, Any]:
+            async with window:
+                return await self.aorchestrate_task(request, llm, model_name)
+        
+        return list(await asyncio.gather(
+            *(run_one(request) for request in requests),
+            return_exceptions=True
+        ))
+    
+    def run_batch(self, requests: List[str], llm: LiteLLMWrapper, model_name: str = "unknown",
+                  concurrency: int = BATCH_CONCURRENCY) -> List[Any]:
+        """
+        Synchronous wrapper around run_batch_async.
+        
+        Must not be called from a running event loop; await
+        run_batch_async there instead.
+        
+        Args:
+            requests: User requests to run
+            llm: LLM wrapper
+            model_name: Model name
+            concurrency: Maximum number of requests orchestrated at once
+            
+        Returns:
+            Orchestration results (or exceptions) in the same order as requests
+        """
+        return asyncio.run(self.run_batch_async(requests, llm, model_name, concurrency))
     
     def _multi_agent_execution(self, request: str, llm: LiteLLMWrapper, model_name: str, decision: Dict) -> Dict[str, Any]:
         """Execute using multiple agents."""
+        # PLAN REUSE
+        plan_key = self._plan_cache_key(request, model_name, decision)
+        cached_plan = self.plan_cache.get(plan_key)
+        plan_note = f"\n\nPlan:\n{cached_plan}" if cached_plan else ""
+        tools = tuple(decision.get("tools") or ())
+        task_type = decision.get("task_type")
+        fan_out = task_type in FAN_OUT_TASK_TYPES
+        
         # AGENT ROLE ASSIGNMENT
-        planner = create_planner_agent(llm, model_name)
-        file_reader = create_file_reader_agent(llm, model_name, decision.get("tools", []))
-        code_analyst = create_code_analyst_agent(llm, model_name, decision.get("tools", []))
-        report_writer = create_report_writer_agent(llm, model_name)
+        planner = agents.create_planner_agent(llm, model_name, allow_delegation=False)
+        file_reader = agents.create_file_reader_agent(llm, model_name, tools)
+        code_analyst = agents.create_code_analyst_agent(llm, model_name, tools)
+        report_writer = agents.create_report_writer_agent(llm, model_name)
         
         # Create tasks
-        planning_task = Task(
+        planning_task = crewai.Task(
             description=f"Analyze the request: {request}\n\nBreak it down into steps and coordinate other agents.",
             agent=planner,
-            expected_output="A clear plan with steps for other agents"
+            expected_output="A clear plan with steps for other agents",
+            async_execution=fan_out
         )
         
-        execution_task = Task(
-            description=f"Execute the plan for: {request}\n\nUse available tools to complete the work.",
-            agent=file_reader if decision.get("task_type") == "read_file" else code_analyst,
-            expected_output="Completed work based on the plan"
-        )
+        if fan_out:
+            # Independent branches run in parallel; the report writer aggregates them
+            work_tasks = [
+                crewai.Task(
+                    description=f"Read the files relevant to: {request}\n\nUse available tools to gather the information needed.{plan_note}",
+                    agent=file_reader,
+                    expected_output="The relevant file contents and key information",
+                    async_execution=True
+                ),
+                crewai.Task(
+                    description=f"Analyze the code relevant to: {request}\n\nUse available tools to complete the analysis.{plan_note}",
+                    agent=code_analyst,
+                    expected_output="Detailed analysis findings",
+                    async_execution=True
+                ),
+            ]
+        else:
+            work_tasks = [
+                crewai.Task(
+                    description=f"Execute the plan for: {request}\n\nUse available tools to complete the work.{plan_note}",
+                    agent=file_reader if task_type == "read_file" else code_analyst,
+                    expected_output="Completed work based on the plan"
+                ),
+            ]
         
-        reporting_task = Task(
+        # Cached plan: skip the planner round-trip entirely
+        upstream_tasks = work_tasks if cached_plan else [planning_task] + work_tasks
+        
+        reporting_task = crewai.Task(
             description=f"Create a comprehensive report for: {request}\n\nSynthesize all information.",
             agent=report_writer,
             expected_output="A clear, comprehensive report",
-            context=[planning_task, execution_task]
+            context=upstream_tasks
         )
+        tasks = upstream_tasks + [reporting_task]
         
         # ORCHESTRATION STRATEGY
-        crew = Crew(
-            agents=[planner, file_reader, code_analyst, report_writer],
-            tasks=[planning_task, execution_task, reporting_task],
-            verbose=True
+        if cached_plan:
+            crew_agents = [file_reader, code_analyst, report_writer]
+            agent_names = ["file_reader", "code_analyst", "report_writer"]
+        else:
+            crew_agents = [planner, file_reader, code_analyst, report_writer]
+            agent_names = ["planner", "file_reader", "code_analyst", "report_writer"]
+        
+        crew = crewai.Crew(
+            agents=crew_agents,
+            tasks=tasks,
+            verbose=agents.VERBOSE
         )
         
         return {
             "orchestration_type": "multi_agent",
-            "agents": ["planner", "file_reader", "code_analyst", "report_writer"],
+            "agents": agent_names,
             "crew": crew,
-            "tasks": [planning_task, execution_task, reporting_task]
+            "tasks": tasks,
+            "plan_cache_key": plan_key,
+            "plan_cache_hit": cached_plan is not None,
+        }
+    
+    async def _amulti_agent_execution(self, request: str, llm: LiteLLMWrapper, model_name: str, decision: Dict) -> Dict[str, Any]:
+        """Execute using multiple agents, running the planner and work branches concurrently."""
+        orchestration, report_messages = await self._agather_findings(request, llm, model_name, decision)
+        async with _llm_semaphore():
+            orchestration["result"] = await llm.achat(report_messages)
+        return orchestration
+    
+    async def _agather_findings(self, request: str, llm: LiteLLMWrapper, model_name: str, decision: Dict) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+        """
+        Run the planner and work branches concurrently and build the report prompt.
+        
+        Returns:
+            The multi-agent orchestration (without "result") and the report
+            writer's messages
+        """
+        plan_key = self._plan_cache_key(request, model_name, decision)
+        cached_plan = self.plan_cache.get(plan_key)
+        plan_note = f"\n\nPlan:\n{cached_plan}" if cached_plan else ""
+        tools = tuple(decision.get("tools") or ())
+        task_type = decision.get("task_type")
+        
+        planner = agents.create_planner_agent(llm, model_name, allow_delegation=False)
+        report_writer = agents.create_report_writer_agent(llm, model_name)
+        
+        # Work branches as (output key, agent name, agent, description, expected output)
+        if task_type in FAN_OUT_TASK_TYPES:
+            branches = [
+                ("file_reader", "file_reader", agents.create_file_reader_agent(llm, model_name, tools),
+                 f"Read the files relevant to: {request}\n\nUse available tools to gather the information needed.{plan_note}",
+                 "The relevant file contents and key information"),
+                ("code_analyst", "code_analyst", agents.create_code_analyst_agent(llm, model_name, tools),
+                 f"Analyze the code relevant to: {request}\n\nUse available tools to complete the analysis.{plan_note}",
+                 "Detailed analysis findings"),
+            ]
+        elif task_type == "read_file":
+            branches = [
+                ("execution", "file_reader", agents.create_file_reader_agent(llm, model_name, tools),
+                 f"Execute the plan for: {request}\n\nUse available tools to complete the work.{plan_note}",
+                 "Completed work based on the plan"),
+            ]
+        else:
+            branches = [
+                ("execution", "code_analyst", agents.create_code_analyst_agent(llm, model_name, tools),
+                 f"Execute the plan for: {request}\n\nUse available tools to complete the work.{plan_note}",
+                 "Completed work based on the plan"),
+            ]
+        
+        async def run_planner() -> str:
+            if cached_plan:
+                return cached_plan
+            async with _llm_semaphore():
+                return await llm.achat(self._agent_messages(
+                    planner,
+                    f"Analyze the request: {request}\n\nBreak it down into steps and coordinate other agents."
+                ))
+        
+        async def run_branch(agent: Any, description: str, expected_output: str) -> str:
+            # Branches need their tools, so each runs through a single-task Crew
+            task = crewai.Task(description=description, agent=agent, expected_output=expected_output)
+            crew = crewai.Crew(agents=[agent], tasks=[task], verbose=agents.VERBOSE)
+            async with _llm_semaphore():
+                output = await crew.kickoff_async()
+            return str(output)
+        
+        try:
+            plan, *branch_outputs = await asyncio.gather(
+                run_planner(),
+                *(run_branch(agent, description, expected) for _, _, agent, description, expected in branches)
+            )
+        except Exception:
+            self.plan_cache.quarantine(plan_key)
+            raise
+        
+        if not cached_plan:
+            self.plan_cache.set(plan_key, plan)
+        
+        outputs = {"plan": plan}
+        outputs.update((key, output) for (key, *_), output in zip(branches, branch_outputs))
+        findings = "\n\n".join(f"{key.replace('_', ' ').title()} results:\n{output}" for key, output in outputs.items() if key != "plan")
+        
+        report_messages = self._agent_messages(
+            report_writer,
+            f"Create a comprehensive report for: {request}\n\nSynthesize all information.\n\n"
+            f"Plan:\n{plan}\n\n{findings}"
+        )
+        
+        agent_names = [name for _, name, *_ in branches] + ["report_writer"]
+        orchestration = {
+            "orchestration_type": "multi_agent",
+            "agents": agent_names if cached_plan else ["planner"] + agent_names,
+            "outputs": outputs,
+            "plan_cache_key": plan_key,
+            "plan_cache_hit": cached_plan is not None,
         }
+        return orchestration, report_messages
+    
+    def record_outcome(self, orchestration: Dict[str, Any], success: bool, result: Any = None) -> None:
+        """
+        Feed the result of a kicked-off orchestration back into the caches.
+        
+        Successful runs store the planner output for reuse and cacheable
+        single-agent answers; failed runs quarantine their plan so it is
+        never replayed.
+        
+        Args:
+            orchestration: Result of orchestrate_task after its crew has run
+            success: Whether the crew completed successfully
+            result: The crew output, if any
+        """
+        if success and result is not None:
+            exact_key = orchestration.get("exact_cache_key")
+            if exact_key:
+                self.exact_cache.set(exact_key, orchestration["model_name"], result)
+            
+            cache_request = orchestration.get("semantic_cache_request")
+            if cache_request:
+                self.semantic_cache.insert(cache_request, orchestration["model_name"], result)
+        
+        plan_key = orchestration.get("plan_cache_key")
+        if not plan_key:
+            return
+        
+        if not success:
+            self.plan_cache.quarantine(plan_key)
+            return
+        
+        if orchestration.get("plan_cache_hit"):
+            return
+        
+        planning_output = orchestration["tasks"][0].output
+        if planning_output is not None:
+            self.plan_cache.set(plan_key, planning_output)
+    
+    def _plan_cache_key(self, request: str, model_name: str, decision: Dict) -> str:
+        """Fingerprint a request and its decision for the plan cache."""
+        return self.plan_cache.make_key(
+            request,
+            decision.get("task_type"),
+            decision.get("selected_tools", []),
+            model_name
+        )
+    
+    def _agent_messages(self, agent: Any, prompt: str) -> List[Dict[str, str]]:
+        """Build litellm messages that carry an agent's persona."""
+        return [
+            {"role": "system", "content": f"You are the {agent.role}. {agent.backstory}\n\nYour goal: {agent.goal}"},
+            {"role": "user", "content": prompt},
+        ]
+    
+    def _is_direct_llm(self, decision: Dict) -> bool:
+        """Whether a request can be answered by one LLM call without tools."""
+        return decision.get("task_type") is None and decision.get("classification", {}).get("operation_type") is None
+    
+    def _cached_single_agent_execution(self, request: str, llm: LiteLLMWrapper, model_name: str, decision: Dict) -> Dict[str, Any]:
+        """Replay an exact-match cached answer, or fall through to a single agent."""
+        # Only tool-free answers may be replayed; tool-running crews always run
+        exact_key = None
+        if self._is_direct_llm(decision):
+            exact_key = self.exact_cache.make_key(request, decision.get("task_type"), model_name)
+            cached = self.exact_cache.get(exact_key)
+            if cached is not None:
+                return {
+                    "orchestration_type": "exact_cache",
+                    "agents": [],
+                    "result": cached
+                }
+        
+        orchestration = self._single_agent_execution(request, llm, model_name, decision)
+        if orchestration["orchestration_type"] != "cache":
+            orchestration["exact_cache_key"] = exact_key
+        return orchestration
     
     def _single_agent_execution(self, request: str, llm: LiteLLMWrapper, model_name: str, decision: Dict) -> Dict[str, Any]:
         """Execute using single agent."""
-        from agents import create_test_agent
+        # Plain questions need no tool loop: skip Crew and call the LLM directly.
+        # Only these are side-effect free, so only they are served from or stored in cache.
+        if self._is_direct_llm(decision):
+            cached = self.semantic_cache.lookup(request, model_name)
+            if cached is not None:
+                return {
+                    "orchestration_type": "cache",
+                    "agents": [],
+                    "result": cached
+                }
+            
+            return {
+                "orchestration_type": "direct_llm",
+                "agents": ["test_agent"],
+                "messages": [
+                    {"role": "system", "content": agents.render_test_agent_prompt(model_name)},
+                    {"role": "user", "content": request},
+                ],
+                "semantic_cache_request": request,
+                "model_name": model_name
+            }
         
-        agent = create_test_agent(llm, model_name, decision.get("tools", []))
+        agent = agents.create_test_agent(llm, model_name, tuple(decision.get("tools") or ()))
         
-        task = Task(
+        task = crewai.Task(
             description=request,
             agent=agent,
             expected_output="A direct answer to the request"
         )
         
-        crew = Crew(
+        crew = crewai.Crew(
             agents=[agent],
             tasks=[task],
-            verbose=True
+            verbose=agents.VERBOSE
         )
         
         return {
             "orchestration_type": "single_agent",
             "agents": ["test_agent"],
             "crew": crew,
-            "tasks": [task]
+            "tasks": [task],
+            "model_name": model_name
         }
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _orchestrator = None
+_orchestrator_lock = threading.Lock()
+
 
 def get_orchestrator() -> AgentOrchestrator:
     """Get or create global orchestrator."""
     global _orchestrator
     if _orchestrator is None:
-        _orchestrator = AgentOrchestrator()
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = AgentOrchestrator()
     return _orchestrator
-
@@ -4,28 +4,20 @@ This module defines the AI agents that will be part of the crew.
 Now uses tools_registry for comprehensive tool access.
 """
 
+import os
+from functools import lru_cache
 from crewai import Agent
 from llm_wrapper import LiteLLMWrapper
 from tools_registry import get_tool_set, get_tools_by_category
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Sequence
 
 
-def create_test_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[List[Any]] = None) -> Agent:
-    """
-    Create a powerful coding assistant agent with advanced understanding of tools and coding dynamics.
-    
-    Args:
-        llm_wrapper: The LiteLLMWrapper instance to use as the agent's LLM
-        model_name: The name of the model being used (for agent awareness)
-        tools: Optional list of tools to provide to the agent
-        
-    Returns:
-        A configured Agent instance with powerful coding capabilities
-    """
-    return Agent(
-        role="Senior Software Engineer & Code Architect",
-        goal="Solve complex coding problems, analyze codebases, and build production-quality software using advanced tooling and deep programming knowledge.",
-        backstory=f"""You are an elite-level AI coding assistant powered by {model_name}. You are a SENIOR SOFTWARE ENGINEER with complete mastery of ALL available tools.
+# CrewAI verbose output is synchronous stdout I/O on every step - opt in with MYDESKAI_VERBOSE=1
+VERBOSE = os.getenv("MYDESKAI_VERBOSE", "0") == "1"
+
+
+# Backstory templates - rendered per model_name with str.format
+_TEST_AGENT_BACKSTORY = """You are an elite-level AI coding assistant powered by {model_name}. You are a SENIOR SOFTWARE ENGINEER with complete mastery of ALL available tools.
 
 **YOUR EXPERTISE:**
 - Deep understanding of software architecture, design patterns, and best practices
@@ -161,37 +153,13 @@ def create_test_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown",
 - "Run command" → ShellTool(command="...")
 - "What model are you?" → "I am {model_name}, a senior software engineer AI assistant"
 
-You are a CODING MONSTER with complete tool mastery. Use them all. Act like one.""",
-        llm=llm_wrapper,
-        tools=tools or [],
-        verbose=True,
-        allow_delegation=False,
-    )
-
+You are a CODING MONSTER with complete tool mastery. Use them all. Act like one."""
 
-def create_planner_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[List[Any]] = None) -> Agent:
-    """Create the Planner agent that breaks down complex tasks."""
-    return Agent(
-        role="Task Planner",
-        goal="Break down complex user requests into clear, actionable steps and coordinate the work of other agents",
-        backstory=f"""You are an expert project planner powered by {model_name}. When given a task, you analyze it carefully,
+_PLANNER_BACKSTORY = """You are an expert project planner powered by {model_name}. When given a task, you analyze it carefully,
         identify what needs to be done, and create a clear plan. You coordinate with other agents
-        to ensure the work is completed efficiently and correctly. Always identify yourself as {model_name} when asked.""",
-        llm=llm_wrapper,
-        verbose=True,
-        allow_delegation=True,
-    )
-
+        to ensure the work is completed efficiently and correctly. Always identify yourself as {model_name} when asked."""
 
-def create_file_reader_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[List[Any]] = None) -> Agent:
-    """Create the FileReader agent that can read and analyze files."""
-    if tools is None:
-        tools = get_tool_set("file_operations")
-    
-    return Agent(
-        role="File Reader",
-        goal="Read files from the filesystem using available tools and extract relevant information",
-        backstory=f"""You are an expert at reading and understanding files, powered by {model_name}. 
+_FILE_READER_BACKSTORY = """You are an expert at reading and understanding files, powered by {model_name}. 
 
 CRITICAL TOOL USAGE: You have FileReadTool, FileWriterTool, and DirectoryReadTool available. You MUST use them!
 
@@ -212,23 +180,9 @@ When a user asks you to read a file:
 5. Always identify yourself as {model_name} when asked
 
 EXAMPLE: If user says "Read app.py", you MUST call: FileReadTool(file_path="app.py")
-NEVER say you cannot read files - you have FileReadTool! CALL IT!""",
-        llm=llm_wrapper,
-        tools=tools,
-        verbose=True,
-        allow_delegation=False,
-    )
-
+NEVER say you cannot read files - you have FileReadTool! CALL IT!"""
 
-def create_code_analyst_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[List[Any]] = None) -> Agent:
-    """Create the CodeAnalyst agent that analyzes code."""
-    if tools is None:
-        tools = get_tool_set("code_analysis")
-    
-    return Agent(
-        role="Code Analyst",
-        goal="Analyze code for quality, correctness, and adherence to requirements using available tools",
-        backstory=f"""You are an expert code reviewer and analyst powered by {model_name}. You understand programming languages,
+_CODE_ANALYST_BACKSTORY = """You are an expert code reviewer and analyst powered by {model_name}. You understand programming languages,
         best practices, and can identify bugs, code smells, and areas for improvement.
 
 TOOL USAGE - YOU MUST USE THESE TOOLS:
@@ -245,10 +199,110 @@ WORKFLOW FOR CODE ANALYSIS:
 5. Provide detailed analysis based on the actual code content
 
 Always identify yourself as {model_name} when asked.
-NEVER say you cannot read code files - you have FileReadTool! CALL IT FIRST!""",
+NEVER say you cannot read code files - you have FileReadTool! CALL IT FIRST!"""
+
+_REPORT_WRITER_BACKSTORY = """You are an expert technical writer powered by {model_name}. You take information from other agents
+        and synthesize it into clear, well-structured reports. You ensure reports are complete,
+        accurate, and easy to understand. Always identify yourself as {model_name} when asked."""
+
+
+_TEST_AGENT_ROLE = "Senior Software Engineer & Code Architect"
+_TEST_AGENT_GOAL = "Solve complex coding problems, analyze codebases, and build production-quality software using advanced tooling and deep programming knowledge."
+
+
+_BACKSTORIES = {
+    "test": _TEST_AGENT_BACKSTORY,
+    "planner": _PLANNER_BACKSTORY,
+    "file_reader": _FILE_READER_BACKSTORY,
+    "code_analyst": _CODE_ANALYST_BACKSTORY,
+    "report_writer": _REPORT_WRITER_BACKSTORY,
+}
+
+
+@lru_cache(maxsize=32)
+def _backstory(role: str, model_name: str) -> str:
+    """Render the backstory for a role/model pair (formatted once per process)."""
+    return _BACKSTORIES[role].format(model_name=model_name)
+
+
+def render_test_agent_prompt(model_name: str = "unknown") -> str:
+    """Render the test agent's role, goal and backstory as a system prompt for direct LLM calls."""
+    return f"You are the {_TEST_AGENT_ROLE}. {_backstory('test', model_name)}\n\nYour goal: {_TEST_AGENT_GOAL}"
+
+
+def create_test_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[Sequence[Any]] = None) -> Agent:
+    """
+    Create a powerful coding assistant agent with advanced understanding of tools and coding dynamics.
+    
+    Args:
+        llm_wrapper: The LiteLLMWrapper instance to use as the agent's LLM
+        model_name: The name of the model being used (for agent awareness)
+        tools: Optional list (or tuple) of tools to provide to the agent
+        
+    Returns:
+        A configured Agent instance with powerful coding capabilities
+    """
+    return Agent(
+        role=_TEST_AGENT_ROLE,
+        goal=_TEST_AGENT_GOAL,
+        backstory=_backstory("test", model_name),
         llm=llm_wrapper,
-        tools=tools,
-        verbose=True,
+        tools=list(tools or []),
+        verbose=VERBOSE,
+        allow_delegation=False,
+    )
+
+
+def create_planner_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[Sequence[Any]] = None,
+                         allow_delegation: bool = False) -> Agent:
+    """
+    Create the Planner agent that breaks down complex tasks.
+    
+    Delegation is off by default: the orchestrator already fans work out to
+    the downstream agents, and CrewAI's delegation tools add prompt tokens
+    and extra LLM round-trips to every planner call.
+    
+    Args:
+        llm_wrapper: The LiteLLMWrapper instance to use as the agent's LLM
+        model_name: The name of the model being used (for agent awareness)
+        tools: Unused; accepted for signature parity with the other factories
+        allow_delegation: Let the planner delegate to coworkers (legacy behaviour)
+        
+    Returns:
+        A configured planner Agent
+    """
+    return Agent(
+        role="Task Planner",
+        goal="Break down complex user requests into clear, actionable steps and coordinate the work of other agents",
+        backstory=_backstory("planner", model_name),
+        llm=llm_wrapper,
+        verbose=VERBOSE,
+        allow_delegation=allow_delegation,
+    )
+
+
+def create_file_reader_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[Sequence[Any]] = None) -> Agent:
+    """Create the FileReader agent that can read and analyze files."""
+    return Agent(
+        role="File Reader",
+        goal="Read files from the filesystem using available tools and extract relevant information",
+        backstory=_backstory("file_reader", model_name),
+        llm=llm_wrapper,
+        tools=list(tools) if tools is not None else get_tool_set("file_operations"),
+        verbose=VERBOSE,
+        allow_delegation=False,
+    )
+
+
+def create_code_analyst_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "unknown", tools: Optional[Sequence[Any]] = None) -> Agent:
+    """Create the CodeAnalyst agent that analyzes code."""
+    return Agent(
+        role="Code Analyst",
+        goal="Analyze code for quality, correctness, and adherence to requirements using available tools",
+        backstory=_backstory("code_analyst", model_name),
+        llm=llm_wrapper,
+        tools=list(tools) if tools is not None else get_tool_set("code_analysis"),
+        verbose=VERBOSE,
         allow_delegation=False,
     )
 
@@ -258,11 +312,9 @@ def create_report_writer_agent(llm_wrapper: LiteLLMWrapper, model_name: str = "u
     return Agent(
         role="Report Writer",
         goal="Create clear, comprehensive reports based on analysis from other agents",
-        backstory=f"""You are an expert technical writer powered by {model_name}. You take information from other agents
-        and synthesize it into clear, well-structured reports. You ensure reports are complete,
-        accurate, and easy to understand. Always identify yourself as {model_name} when asked.""",
+        backstory=_backstory("report_writer", model_name),
         llm=llm_wrapper,
-        verbose=True,
+        verbose=VERBOSE,
         allow_delegation=False,
     )
 
@@ -5,53 +5,150 @@ Phase 2: MVP Dashboard Implementation
 This module provides the Streamlit UI for interacting with AI agent swarms.
 """
 
+from __future__ import annotations
+
+import hashlib
 import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from types import MappingProxyType
 import streamlit as st
-from dotenv import load_dotenv
-from crewai import Crew
-from llm_wrapper import LiteLLMWrapper
-from agents import (
-    create_test_agent,
-    create_planner_agent,
-    create_file_reader_agent,
-    create_code_analyst_agent,
-    create_report_writer_agent
-)
-from tasks import create_test_task
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from dotenv import dotenv_values, find_dotenv
+from lazy_imports import lazy_import
 from smart_router import route_model
-from tool_selector import get_tool_selector
-from decision_engine import get_decision_engine
-from agent_orchestrator import get_orchestrator
 from error_handling_cascades import get_error_handler
-from output_formatter import get_output_formatter
-from crewai.events.event_bus import crewai_event_bus
-from crewai.events.base_event_listener import BaseEventListener
-from crewai.events.types.llm_events import LLMStreamChunkEvent
-from crewai.events.types.agent_events import (
-    AgentExecutionStartedEvent,
-    AgentExecutionCompletedEvent,
-    AgentExecutionErrorEvent
-)
-from crewai.events.types.task_events import (
-    TaskStartedEvent,
-    TaskCompletedEvent,
-    TaskFailedEvent
-)
-from crewai.events.types.tool_usage_events import (
-    ToolUsageStartedEvent,
-    ToolUsageFinishedEvent,
-    ToolUsageErrorEvent
-)
+
+# CrewAI, litellm and the agent stack load on first use - the warm-up after the
+# first render, or the first request - so the UI paints without importing them
+crewai = lazy_import("crewai")
+agents = lazy_import("agents")
+tasks = lazy_import("tasks")
+llm_wrapper = lazy_import("llm_wrapper")
+stream_listener = lazy_import("stream_listener")
+
+
+# Streamlit re-executes this script on every interaction, so process-wide
+# memoization has to go through st.cache_data rather than module globals
+@st.cache_data
+def parse_env_file(path: str, mtime: float) -> dict:
+    """
+    Parse a .env file with python-dotenv (cached per path and modification time).
+    
+    Args:
+        path: Path of the .env file
+        mtime: Modification time of the file - part of the cache key only
+        
+    Returns:
+        Variable names mapped to their values (names declared without a value are skipped, as load_dotenv does)
+    """
+    return {name: value for name, value in dotenv_values(path).items() if value is not None}
+
+
+def load_env_file(path: str = ""):
+    """
+    Export variables from a .env file without overriding the environment (like load_dotenv).
+    
+    Without a path the file is located like load_dotenv does, with
+    find_dotenv (the app's directory, then its parents). The file is only
+    re-parsed when its modification time changes.
+    """
+    path = path or find_dotenv()
+    if not path:
+        return
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return
+    for name, value in parse_env_file(path, mtime).items():
+        os.environ.setdefault(name, value)
+
+
+# Environment variables litellm reads each provider's key from
+API_KEY_ENV_VARS = {
+    "gemini": "GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY",
+}
 
 
 def load_keys_from_env():
     """Load API keys from .env file if it exists."""
-    load_dotenv()
-    keys = {
-        "gemini": os.getenv("GEMINI_API_KEY", "").strip('"').strip("'"),
-        "openai": os.getenv("OPENAI_API_KEY", "").strip('"').strip("'"),
+    load_env_file()
+    return {
+        provider: os.getenv(env_var, "").strip("\"'")
+        for provider, env_var in API_KEY_ENV_VARS.items()
     }
-    return keys
+
+
+@st.cache_data(ttl=60)
+def env_file_exists() -> bool:
+    """Whether load_env_file would find a .env file (checked at most once a minute)."""
+    return bool(find_dotenv())
+
+
+@st.cache_resource
+def load_services():
+    """Build the decision engine, orchestrator and error handler once per process."""
+    # Imported here: both pull in the tool registry and CrewAI
+    from decision_engine import get_decision_engine
+    from agent_orchestrator import get_orchestrator
+    return get_decision_engine(), get_orchestrator(), get_error_handler()
+
+
+# Supported models, in preference order: which API key each needs and its endpoint
+# (api_base None means litellm's default endpoint for the provider). Read-only,
+# since the table is shared by every session and cached function in the process.
+MODEL_PROVIDERS = MappingProxyType({
+    "gpt-3.5-turbo": MappingProxyType({"key_source": "openai", "api_base": None}),
+    "gemini/gemini-1.5-flash": MappingProxyType({"key_source": "gemini", "api_base": None}),
+})
+
+
+@st.cache_resource(max_entries=8)
+def get_llm(model_name: str, api_key_fingerprint: str, temperature: float = 0.7) -> llm_wrapper.LiteLLMWrapper:
+    """
+    Get a shared LLM wrapper for a model.
+    
+    Reusing the wrapper keeps the pooled agents built around it warm. The
+    fingerprint of the provider key is part of the cache key, so a new key
+    gets a new wrapper; the key itself never reaches the cache.
+    """
+    # litellm reads API keys from environment variables
+    return llm_wrapper.LiteLLMWrapper(
+        model_name=model_name,
+        temperature=temperature,
+        api_base=MODEL_PROVIDERS[model_name]["api_base"],
+    )
+
+
+def key_fingerprint(model_name: str) -> str:
+    """Short SHA-256 prefix of the API key used for a model."""
+    provider = MODEL_PROVIDERS[model_name]["key_source"]
+    return hashlib.sha256(st.session_state.api_keys[provider].encode("utf-8")).hexdigest()[:16]
+
+
+@st.cache_data
+def get_available_models(configured_providers: frozenset) -> tuple:
+    """Models usable with the configured keys, in preference order."""
+    return tuple(
+        model for model, config in MODEL_PROVIDERS.items()
+        if config["key_source"] in configured_providers
+    )
+
+
+def refresh_available_models():
+    """Recompute st.session_state.available_models after the API keys change."""
+    st.session_state.available_models = get_available_models(
+        frozenset(provider for provider, key in st.session_state.api_keys.items() if key)
+    )
+
+
+# Chat history kept per session, and how many of the newest messages render by default
+CHAT_HISTORY_LIMIT = 100
+CHAT_RENDER_LIMIT = 20
 
 
 # Initialize session state
@@ -63,152 +160,175 @@ if "api_keys" not in st.session_state:
         "openai": env_keys.get("openai", ""),
     }
 
+if "available_models" not in st.session_state:
+    refresh_available_models()
+
 if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
+    st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
 
 if "current_model" not in st.session_state:
     st.session_state.current_model = "gpt-3.5-turbo"
 
 
-class StreamlitStreamListener(BaseEventListener):
-    """Event listener to capture streaming chunks and agent activity for Streamlit display."""
-    
-    def __init__(self, stream_container, log_container=None):
-        self.stream_container = stream_container
-        self.log_container = log_container
-        self.accumulated_text = ""
-        self.activity_log = []  # Store activity log entries
-        self.setup_listeners()
-    
-    def setup_listeners(self):
-        # Existing listener for final text output
-        @crewai_event_bus.on(LLMStreamChunkEvent)
-        def on_llm_stream_chunk(self, event: LLMStreamChunkEvent):
-            """Handle each streaming chunk."""
-            if event.chunk:
-                self.accumulated_text += event.chunk
-                # Update the stream container with accumulated text
-                self.stream_container.markdown(self.accumulated_text)
-        
-        # Agent execution events
-        @crewai_event_bus.on(AgentExecutionStartedEvent)
-        def on_agent_started(self, event: AgentExecutionStartedEvent):
-            """Handle when an agent starts executing."""
-            agent_name = getattr(event.agent, 'role', 'Unknown Agent')
-            message = f"🤖 **{agent_name}** started working on task"
-            self._add_log_entry(message, "info")
-        
-        @crewai_event_bus.on(AgentExecutionCompletedEvent)
-        def on_agent_completed(self, event: AgentExecutionCompletedEvent):
-            """Handle when an agent completes execution."""
-            agent_name = getattr(event.agent, 'role', 'Unknown Agent')
-            output_preview = str(event.output)[:150] + "..." if len(str(event.output)) > 150 else str(event.output)
-            message = f"✅ **{agent_name}** completed task\n\n*Output preview: {output_preview}*"
-            self._add_log_entry(message, "success")
-        
-        @crewai_event_bus.on(AgentExecutionErrorEvent)
-        def on_agent_error(self, event: AgentExecutionErrorEvent):
-            """Handle when an agent encounters an error."""
-            agent_name = getattr(event.agent, 'role', 'Unknown Agent')
-            message = f"❌ **{agent_name}** encountered an error: {event.error}"
-            self._add_log_entry(message, "error")
-        
-        # Task events
-        @crewai_event_bus.on(TaskStartedEvent)
-        def on_task_started(self, event: TaskStartedEvent):
-            """Handle when a task starts."""
-            task_name = getattr(event.task, 'description', 'Unknown Task')[:100] if event.task else "Unknown Task"
-            message = f"📋 Task started: *{task_name}*"
-            self._add_log_entry(message, "info")
-        
-        @crewai_event_bus.on(TaskCompletedEvent)
-        def on_task_completed(self, event: TaskCompletedEvent):
-            """Handle when a task completes."""
-            task_name = getattr(event.task, 'description', 'Unknown Task')[:100] if event.task else "Unknown Task"
-            output_preview = str(event.output)[:150] + "..." if len(str(event.output)) > 150 else str(event.output)
-            message = f"✅ Task completed: *{task_name}*\n\n*Output: {output_preview}*"
-            self._add_log_entry(message, "success")
-        
-        @crewai_event_bus.on(TaskFailedEvent)
-        def on_task_failed(self, event: TaskFailedEvent):
-            """Handle when a task fails."""
-            task_name = getattr(event.task, 'description', 'Unknown Task')[:100] if event.task else "Unknown Task"
-            message = f"❌ Task failed: *{task_name}*\n\n*Error: {event.error}*"
-            self._add_log_entry(message, "error")
-        
-        # Tool usage events
-        @crewai_event_bus.on(ToolUsageStartedEvent)
-        def on_tool_started(self, event: ToolUsageStartedEvent):
-            """Handle when a tool execution starts."""
-            agent_role = event.agent_role or "Unknown Agent"
-            tool_name = event.tool_name
-            tool_args = str(event.tool_args)[:100] if event.tool_args else "No args"
-            message = f"🔧 **{agent_role}** using tool: `{tool_name}`\n*Input: {tool_args}*"
-            self._add_log_entry(message, "info")
+# Generic "I am an AI assistant..." opening sentence stripped from answers
+GENERIC_PREFIX_RE = re.compile(r"^\s*I(?:'m| am) an AI assistant[^.]*\.\s*")
+
+
+
+def apply_api_keys_to_env():
+    """
+    Export the session's API keys for litellm, writing only values that changed.
+    
+    os.environ writes go through putenv, so unchanged keys are skipped; the
+    comparison still lets another browser session's keys be swapped back.
+    """
+    api_keys = st.session_state.api_keys  # one session_state lookup per call
+    for provider, env_var in API_KEY_ENV_VARS.items():
+        value = api_keys[provider]
+        if value and os.environ.get(env_var) != value:
+            os.environ[env_var] = value
+
+
+def sync_api_keys():
+    """Copy the API key inputs into st.session_state.api_keys (Save Keys on_click callback)."""
+    new_keys = {provider: st.session_state[f"{provider}_key_input"] for provider in API_KEY_ENV_VARS}
+    if new_keys == st.session_state.api_keys:
+        return
+    
+    # Swap the whole dict in one assignment so readers never see a half-updated set
+    st.session_state.api_keys = new_keys
+    refresh_available_models()
+    apply_api_keys_to_env()
+
+
+# Crew kickoffs that may run at once across all sessions
+KICKOFF_WORKERS = int(os.getenv("MYDESKAI_KICKOFF_WORKERS", "4"))
+
+
+@st.cache_resource
+def get_kickoff_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool that runs crew kickoffs off the script thread."""
+    return ThreadPoolExecutor(max_workers=KICKOFF_WORKERS, thread_name_prefix="crew-kickoff")
+
+
+def run_streaming(work, stream_run: stream_listener.StreamRun, stream_placeholder):
+    """
+    Run work on the kickoff pool while streaming its output into the page.
+    
+    The script thread drains the run's chunk queue with
+    render_stream_blocks, so each (coalesced) update re-sends only the
+    unfinished trailing markdown block, not the whole accumulated answer.
+    
+    Args:
+        work: Zero-argument callable run on the pool thread
+        stream_run: Streaming state whose chunk queue receives the text
+        stream_placeholder: Placeholder the streamed text is written to
         
-        @crewai_event_bus.on(ToolUsageFinishedEvent)
-        def on_tool_finished(self, event: ToolUsageFinishedEvent):
-            """Handle when a tool execution completes."""
-            agent_role = event.agent_role or "Unknown Agent"
-            tool_name = event.tool_name
-            output_preview = str(event.output)[:150] + "..." if len(str(event.output)) > 150 else str(event.output)
-            cache_status = " (cached)" if event.from_cache else ""
-            message = f"✅ **{agent_role}** finished using `{tool_name}`{cache_status}\n*Output: {output_preview}*"
-            self._add_log_entry(message, "success")
+    Returns:
+        The return value of work
+    """
+    ctx = get_script_run_ctx()
+    
+    def run():
+        # Pool threads are shared across sessions, so attach this session's context per run
+        add_script_run_ctx(threading.current_thread(), ctx)  # lets the activity log update from the worker
+        token = stream_listener.current_stream_run.set(stream_run)
+        try:
+            return work()
+        finally:
+            stream_listener.current_stream_run.reset(token)
+            stream_run.put_chunk(stream_listener.STREAM_END)
+    
+    future = get_kickoff_executor().submit(run)
+    # Returns once the worker has queued STREAM_END, i.e. the work is over
+    stream_listener.render_stream_blocks(stream_placeholder, stream_listener.coalesce_chunks(stream_run.chunks))
+    return future.result()
+
+
+def kickoff_streaming(crew, stream_run: stream_listener.StreamRun, stream_placeholder):
+    """
+    Kick off a crew on the kickoff pool, streaming its output into the page.
+    
+    Args:
+        crew: Crew to kick off
+        stream_run: Streaming state whose chunk queue receives the text
+        stream_placeholder: Placeholder the streamed text is written to
         
-        @crewai_event_bus.on(ToolUsageErrorEvent)
-        def on_tool_error(self, event: ToolUsageErrorEvent):
-            """Handle when a tool execution encounters an error."""
-            agent_role = event.agent_role or "Unknown Agent"
-            tool_name = event.tool_name
-            error_msg = str(event.error)[:200]
-            message = f"❌ **{agent_role}** error with tool `{tool_name}`: {error_msg}"
-            self._add_log_entry(message, "error")
-    
-    def _add_log_entry(self, message: str, level: str = "info"):
-        """Add an entry to the activity log and update the UI."""
-        self.activity_log.append({"message": message, "level": level})
+    Returns:
+        The crew output
+    """
+    # kickoff() already runs off the script thread; kickoff_async() would only
+    # move it to another thread that lacks this session's script context
+    return run_streaming(crew.kickoff, stream_run, stream_placeholder)
+
+
+def stream_direct_llm(llm: llm_wrapper.LiteLLMWrapper, messages, stream_run: stream_listener.StreamRun, stream_placeholder) -> str:
+    """
+    Answer a direct LLM request, streaming tokens into the page.
+    
+    The request runs on the shared LLM event loop (one pooled AsyncClient
+    for the whole process); a kickoff pool thread relays its chunks, so the
+    script thread renders each chunk while the rest of the reply is still
+    being generated.
+    
+    Args:
+        llm: LLM wrapper to answer with
+        messages: Messages prepared by the orchestrator
+        stream_run: Streaming state whose chunk queue receives the text
+        stream_placeholder: Placeholder the streamed text is written to
         
-        # Update the log container if available
-        if self.log_container:
-            # Clear and rebuild the log display
-            log_text = ""
-            for entry in self.activity_log[-20:]:  # Show last 20 entries
-                if entry["level"] == "info":
-                    log_text += f"ℹ️ {entry['message']}\n\n"
-                elif entry["level"] == "success":
-                    log_text += f"✅ {entry['message']}\n\n"
-                elif entry["level"] == "error":
-                    log_text += f"❌ {entry['message']}\n\n"
-                else:
-                    log_text += f"{entry['message']}\n\n"
-            
-            self.log_container.markdown(log_text)
+    Returns:
+        The full reply text
+    """
+    def pump() -> str:
+        chunks = []
+        for chunk in llm.stream_chat(messages):
+            chunks.append(chunk)
+            stream_run.put_chunk(chunk)
+        return "".join(chunks)
+    
+    return run_streaming(pump, stream_run, stream_placeholder)
+
+
+@st.cache_resource
+def get_stream_listener() -> stream_listener.StreamlitStreamListener:
+    """The process-wide stream listener (its handlers are registered on the event bus once)."""
+    return stream_listener.StreamlitStreamListener()
 
 
 def render_settings_sidebar():
     """Render the settings sidebar for API key management."""
     with st.sidebar:
-        st.title("Settings")
-        
-        st.markdown("### API Keys")
-        
-        # Check if .env file exists and offer to load from it
-        env_file_exists = os.path.exists(".env")
-        if env_file_exists and not st.session_state.api_keys.get("openai") and not st.session_state.api_keys.get("gemini"):
-            if st.button("Load Keys from .env File", use_container_width=True):
-                env_keys = load_keys_from_env()
-                st.session_state.api_keys["gemini"] = env_keys.get("gemini", "")
-                st.session_state.api_keys["openai"] = env_keys.get("openai", "")
-                st.rerun()
-            st.info("Found .env file. Click above to load keys, or enter manually below.")
-        elif env_file_exists:
-            st.success("Keys loaded from .env file")
-        else:
-            st.info("Enter your API keys below. Keys are stored securely in session state.")
-        
-        # Gemini API Key
-        gemini_key = st.text_input(
+        render_settings()
+
+
+# A fragment reruns on its own widget changes, so editing a key does not redraw the chat
+@st.fragment
+def render_settings():
+    """Render the settings panel (API keys, model selection, status)."""
+    st.title("Settings")
+    
+    st.markdown("### API Keys")
+    
+    # Check if .env file exists and offer to load from it
+    env_exists = env_file_exists()
+    if env_exists and not st.session_state.api_keys.get("openai") and not st.session_state.api_keys.get("gemini"):
+        if st.button("Load Keys from .env File", use_container_width=True):
+            env_keys = load_keys_from_env()
+            st.session_state.api_keys["gemini"] = env_keys.get("gemini", "")
+            st.session_state.api_keys["openai"] = env_keys.get("openai", "")
+            refresh_available_models()
+            st.rerun()
+        st.info("Found .env file. Click above to load keys, or enter manually below.")
+    elif env_exists:
+        st.success("Keys loaded from .env file")
+    else:
+        st.info("Enter your API keys below. Keys are stored securely in session state.")
+    
+    # API key inputs - batched in a form so editing both keys costs one rerun;
+    # the submit callback saves them to session state before that rerun
+    with st.form("api_keys_form", border=False):
+        st.text_input(
             "Google Gemini API Key",
             value=st.session_state.api_keys["gemini"],
             type="password",
@@ -216,8 +336,7 @@ def render_settings_sidebar():
             key="gemini_key_input"
         )
         
-        # OpenAI API Key
-        openai_key = st.text_input(
+        st.text_input(
             "OpenAI API Key",
             value=st.session_state.api_keys["openai"],
             type="password",
@@ -225,61 +344,66 @@ def render_settings_sidebar():
             key="openai_key_input"
         )
         
-        # Save keys to session state
-        if gemini_key != st.session_state.api_keys["gemini"]:
-            st.session_state.api_keys["gemini"] = gemini_key
-            st.rerun()
-        
-        if openai_key != st.session_state.api_keys["openai"]:
-            st.session_state.api_keys["openai"] = openai_key
-            st.rerun()
-        
-        # Model selection
-        st.markdown("### Model Selection")
-        available_models = []
-        # OpenAI
-        if st.session_state.api_keys["openai"]:
-            available_models.append("gpt-3.5-turbo")
-        # Gemini support via litellm
-        if st.session_state.api_keys["gemini"]:
-            available_models.append("gemini/gemini-1.5-flash")
-        
-        if available_models:
-            # Default to OpenAI if available, otherwise first available
-            default_index = 0
-            if st.session_state.current_model not in available_models:
-                st.session_state.current_model = available_models[0]
-            else:
-                default_index = available_models.index(st.session_state.current_model)
-            
-            selected_model = st.selectbox(
-                "Select Model",
-                options=available_models,
-                index=default_index,
-                help="Choose which LLM to use for agent responses."
-            )
-            st.session_state.current_model = selected_model
+        st.form_submit_button("Save Keys", use_container_width=True, on_click=sync_api_keys)
+    
+    # Model selection
+    st.markdown("### Model Selection")
+    available_models = st.session_state.available_models
+    
+    if available_models:
+        # Default to OpenAI if available, otherwise first available
+        default_index = 0
+        if st.session_state.current_model not in available_models:
+            st.session_state.current_model = available_models[0]
         else:
-            st.warning("Please add at least one API key to continue.")
-            st.session_state.current_model = None
-        
-        # Info about Gemini
-        if st.session_state.api_keys["gemini"] and not st.session_state.api_keys["openai"]:
-            st.info("Gemini key detected. Gemini support is available via litellm.")
-        
-        # Clear chat button
-        st.markdown("---")
-        if st.button("Clear Chat History", use_container_width=True):
-            st.session_state.chat_history = []
-            st.rerun()
+            default_index = available_models.index(st.session_state.current_model)
         
-        # Status indicator
-        st.markdown("---")
-        st.markdown("### Status")
-        if st.session_state.api_keys["openai"] or st.session_state.api_keys["gemini"]:
-            st.success("Ready")
-        else:
-            st.error("No API keys configured")
+        selected_model = st.selectbox(
+            "Select Model",
+            options=available_models,
+            index=default_index,
+            help="Choose which LLM to use for agent responses."
+        )
+        st.session_state.current_model = selected_model
+    else:
+        st.warning("Please add at least one API key to continue.")
+        st.session_state.current_model = None
+    
+    # Info about Gemini
+    if st.session_state.api_keys["gemini"] and not st.session_state.api_keys["openai"]:
+        st.info("Gemini key detected. Gemini support is available via litellm.")
+    
+    # Clear chat button
+    st.markdown("---")
+    if st.button("Clear Chat History", use_container_width=True):
+        st.session_state.chat_history.clear()
+        st.rerun()
+    
+    # Status indicator
+    st.markdown("---")
+    st.markdown("### Status")
+    if st.session_state.api_keys["openai"] or st.session_state.api_keys["gemini"]:
+        st.success("Ready")
+    else:
+        st.error("No API keys configured")
+
+
+@st.fragment
+def render_chat_history():
+    """
+    Render the chat history - only the newest messages unless older ones are requested.
+    
+    A fragment, so toggling the older-messages checkbox re-renders just the
+    history instead of rerunning the whole script.
+    """
+    history = st.session_state.chat_history
+    older_count = len(history) - CHAT_RENDER_LIMIT
+    start = 0
+    if older_count > 0 and not st.checkbox(f"Show {older_count} older messages", key="show_older_messages"):
+        start = older_count
+    # Markdown is converted to HTML in the browser; the server only sends the source text
+    for message in islice(history, start, None):
+        st.chat_message(message["role"]).markdown(message["content"])
 
 
 def render_chat_interface():
@@ -304,25 +428,20 @@ def render_chat_interface():
             """)
         st.markdown("---")
     else:
-        # Display chat history
-        for message in st.session_state.chat_history:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+        render_chat_history()
     
     # Chat input
     if prompt := st.chat_input("Enter your task or question..."):
-        # Add user message to history
-        st.session_state.chat_history.append({
-            "role": "user",
-            "content": prompt
-        })
-        
-        # Display user message
+        # Display user message (process_user_request adds it to the history with the answer)
         with st.chat_message("user"):
             st.markdown(prompt)
         
         # Check if API keys are configured
         if not st.session_state.current_model:
+            st.session_state.chat_history.append({
+                "role": "user",
+                "content": prompt
+            })
             with st.chat_message("assistant"):
                 st.error("Please configure at least one API key in the Settings sidebar to continue.")
             return
@@ -331,14 +450,158 @@ def render_chat_interface():
         process_user_request(prompt)
 
 
+# Bullet items ("- item" / "* item") of a multi-request prompt
+BATCH_ITEM_RE = re.compile(r"^\s*[-*]\s+(.+?)\s*$")
+
+
+def split_batch_prompt(prompt: str) -> list:
+    """
+    Split a bullet-list prompt into one request per item.
+    
+    Lines before the first bullet are a shared preamble ("Analyze these
+    files:") and are prefixed to every item.
+    
+    Args:
+        prompt: The user's prompt
+        
+    Returns:
+        The item requests, or [prompt] unless the prompt has two or more bullets
+    """
+    if "\n- " not in prompt and "\n* " not in prompt:
+        return [prompt]
+    
+    preamble = []
+    items = []
+    for line in prompt.splitlines():
+        match = BATCH_ITEM_RE.match(line)
+        if match:
+            items.append(match.group(1))
+        elif items:
+            # Prose after the list (or between items) - not a plain batch
+            if line.strip():
+                return [prompt]
+        elif line.strip():
+            preamble.append(line.strip())
+    
+    if len(items) < 2:
+        return [prompt]
+    prefix = " ".join(preamble)
+    return [f"{prefix}\n{item}" if prefix else item for item in items]
+
+
+def result_text(result) -> str:
+    """Get the answer text from a crew output, streamed reply or cached answer."""
+    # crewai returns the task output (cache hits are plain strings)
+    output = getattr(result, 'raw', None) or getattr(result, 'output', None) or result
+    # str() only once, and only on the chosen value (CrewOutput.__str__ can be large)
+    return output if isinstance(output, str) else str(output)
+
+
+def run_prompt_batch(requests: list, llm: llm_wrapper.LiteLLMWrapper, model_name: str) -> str:
+    """
+    Run independent requests concurrently and join their answers.
+    
+    Uses the orchestrator's batch runner, which bounds how many requests
+    are in flight at once.
+    
+    Args:
+        requests: Item requests from split_batch_prompt
+        llm: LLM wrapper for the routed model
+        model_name: The routed model name
+        
+    Returns:
+        Markdown with one heading per request
+    """
+    _, orchestrator, _ = load_services()
+    outcomes = orchestrator.run_batch(requests, llm, model_name)
+    
+    sections = []
+    for i, (request, outcome) in enumerate(zip(requests, outcomes), 1):
+        if isinstance(outcome, Exception):
+            text = f"Error: {outcome}"
+        else:
+            text = GENERIC_PREFIX_RE.sub("", result_text(outcome.get("result")), count=1)
+        sections.append(f"### {i}. {request.splitlines()[-1]}\n\n{text}")
+    return "\n\n".join(sections)
+
+
+def run_single_request(prompt: str, llm: llm_wrapper.LiteLLMWrapper, model_name: str, log_container, stream_placeholder):
+    """
+    Orchestrate one request and run its crew, streaming into the page.
+    
+    Args:
+        prompt: The user's request
+        llm: LLM wrapper for the routed model
+        model_name: The routed model name
+        log_container: Placeholder the activity log is written to
+        stream_placeholder: Placeholder the streamed answer is written to
+        
+    Returns:
+        The crew output, streamed reply or cached answer
+    """
+    decision_engine, orchestrator, error_handler = load_services()
+    
+    context = {
+        "current_directory": os.getcwd(),
+        "project_type": "python",
+    }
+    
+    decision = None
+    orchestration = None
+    try:
+        # Process request through decision engine
+        decision = decision_engine.process_request(prompt, context=context)
+        
+        # Orchestrate using appropriate agent strategy
+        # Direct LLM answers are left to stream_direct_llm below
+        orchestration = orchestrator.orchestrate_task(prompt, llm, model_name, run_direct=False)
+        
+        # Use orchestrated crew (cache hits carry a result instead)
+        crew = orchestration.get("crew")
+        
+    except Exception as e:
+        # Error handling cascade
+        error_result = error_handler.handle_error(e, context={"prompt": prompt})
+        
+        if error_result.get("can_continue"):
+            # Fallback to simple agent
+            selected_tools = decision.get("tools", []) if decision else []
+            agent = agents.create_test_agent(llm, model_name=model_name, tools=selected_tools)
+            task = tasks.create_test_task(agent, prompt)
+            crew = crewai.Crew(agents=[agent], tasks=[task], verbose=agents.VERBOSE)
+        else:
+            raise
+    
+    # Point the shared streaming listener at this request's log container
+    stream_run = get_stream_listener().start_run(log_container)
+    
+    # Run the crew
+    if crew is None and "result" in orchestration:
+        result = orchestration["result"]
+    else:
+        try:
+            if crew is None:
+                result = stream_direct_llm(llm, orchestration["messages"], stream_run, stream_placeholder)
+            else:
+                with st.status("Running agents...", expanded=False) as status:
+                    result = kickoff_streaming(crew, stream_run, stream_placeholder)
+                    stream_run.flush_log()
+                    status.update(label="Agents finished", state="complete")
+        except Exception:
+            if orchestration:
+                orchestrator.record_outcome(orchestration, success=False)
+            raise
+        if orchestration:
+            orchestrator.record_outcome(orchestration, success=True, result=result)
+    
+    return result
+
+
 def process_user_request(prompt: str):
     """Process a user request by creating and running a crew."""
     with st.chat_message("assistant"):
-        # Set up API keys in environment (litellm reads from environment variables)
-        if st.session_state.api_keys["gemini"]:
-            os.environ["GEMINI_API_KEY"] = st.session_state.api_keys["gemini"]
-        if st.session_state.api_keys["openai"]:
-            os.environ["OPENAI_API_KEY"] = st.session_state.api_keys["openai"]
+        # Make sure this session's keys are the ones in the environment (no-op unless they changed)
+        apply_api_keys_to_env()
         
         # Create activity log container (expander for agent work visibility)
         log_expander = st.expander("🔍 Agent Activity Log", expanded=True)
@@ -349,6 +612,7 @@ def process_user_request(prompt: str):
         # Create stream container for real-time output
         stream_placeholder = st.empty()
         
+        reply = None
         try:
             with st.spinner("Processing your request..."):
                 # Validate model selection
@@ -356,90 +620,46 @@ def process_user_request(prompt: str):
                     raise ValueError("No model selected. Please configure API keys and select a model.")
                 
                 # Smart router: select best model based on prompt
-                available_models = []
-                if st.session_state.api_keys["openai"]:
-                    available_models.append("gpt-3.5-turbo")
-                if st.session_state.api_keys["gemini"]:
-                    available_models.append("gemini/gemini-1.5-flash")
+                model_name = route_model(prompt, st.session_state.available_models)
                 
-                model_name = route_model(prompt, available_models)
+                # Reuse the LLM wrapper for this model/key (litellm reads API keys from environment variables)
+                llm = get_llm(model_name, key_fingerprint(model_name))
                 
-                # Create LLM wrapper (litellm reads API keys from environment variables)
-                llm = LiteLLMWrapper(
-                    model_name=model_name,
-                    temperature=0.7,
-                )
-                
-                # Use Claude Code decision engine and orchestrator
-                decision_engine = get_decision_engine()
-                orchestrator = get_orchestrator()
-                error_handler = get_error_handler()
-                
-                context = {
-                    "current_directory": os.getcwd(),
-                    "project_type": "python",
-                }
-                
-                decision = None
-                try:
-                    # Process request through decision engine
-                    decision = decision_engine.process_request(prompt, context=context)
-                    
-                    # Orchestrate using appropriate agent strategy
-                    orchestration = orchestrator.orchestrate_task(prompt, llm, model_name)
-                    
-                    # Use orchestrated crew
-                    crew = orchestration["crew"]
-                    
-                except Exception as e:
-                    # Error handling cascade
-                    error_result = error_handler.handle_error(e, context={"prompt": prompt})
-                    
-                    if error_result.get("can_continue"):
-                        # Fallback to simple agent
-                        selected_tools = decision.get("tools", []) if decision else []
-                        agent = create_test_agent(llm, model_name=model_name, tools=selected_tools)
-                        task = create_test_task(agent, prompt)
-                        crew = Crew(agents=[agent], tasks=[task], verbose=True)
-                    else:
-                        raise
-                
-                # Set up streaming listener with log container
-                # Note: We keep a reference to the listener to ensure event handlers remain active
-                _listener = StreamlitStreamListener(stream_placeholder, log_container)
-                
-                # Run the crew
-                result = crew.kickoff()
-                
-                # Get final result text - crewai returns the task output
-                if hasattr(result, 'raw'):
-                    final_text = str(result.raw) if result.raw else str(result)
-                elif hasattr(result, 'output'):
-                    final_text = str(result.output) if result.output else str(result)
+                # Bullet-list prompts fan out into one concurrent request per item
+                batch = split_batch_prompt(prompt)
+                if len(batch) > 1:
+                    # Batch answers are shown when all are done; only the activity log streams
+                    stream_run = get_stream_listener().start_run(log_container, stream=False)
+                    token = stream_listener.current_stream_run.set(stream_run)
+                    try:
+                        with st.status(f"Running {len(batch)} requests concurrently...", expanded=False) as status:
+                            final_text = run_prompt_batch(batch, llm, model_name)
+                            status.update(label="Requests finished", state="complete")
+                    finally:
+                        stream_listener.current_stream_run.reset(token)
                 else:
-                    final_text = str(result)
+                    result = run_single_request(prompt, llm, model_name, log_container, stream_placeholder)
+                    final_text = result_text(result)
                 
-                # Clean up the response - remove any generic prefixes
-                if final_text.startswith("I am an AI assistant") or final_text.startswith("I'm an AI assistant"):
-                    # Try to extract the actual answer part
-                    final_text = final_text.split(".", 1)[1].strip() if "." in final_text else final_text
+                # Clean up the response - remove any generic prefix sentence
+                final_text = GENERIC_PREFIX_RE.sub("", final_text, count=1)
                 
                 # Update stream container with final result
                 stream_placeholder.markdown(final_text)
                 
-                # Add assistant response to chat history
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": final_text
-                })
+                reply = final_text
                 
         except Exception as e:
             error_message = f"Error: {str(e)}"
             stream_placeholder.error(error_message)
-            st.session_state.chat_history.append({
-                "role": "assistant",
-                "content": error_message
-            })
+            reply = error_message
+        finally:
+            # Add the turn to chat history in one write - also when Streamlit stops or
+            # reruns mid-generation (BaseExceptions), so the prompt is never lost
+            turn = [{"role": "user", "content": prompt}]
+            if reply is not None:
+                turn.append({"role": "assistant", "content": reply})
+            st.session_state.chat_history.extend(turn)
 
 
 def main():
@@ -464,6 +684,12 @@ def main():
         "</div>",
         unsafe_allow_html=True
     )
+    
+    # Warm the cached per-process resources after the page has rendered, so
+    # the first prompt does not pay for their construction (no-op once cached)
+    load_services()
+    get_stream_listener()
+    get_kickoff_executor()
 
 
 if __name__ == "__main__":
@@ -3,11 +3,108 @@ Code Generation Handler - Section 3 of Claude Code Plan
 Handles code generation, component creation, and implementation
 """
 
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 import re
+import threading
 from file_operations_handler import get_file_handler
 
 
+# Component templates, built once at import. They are str.format templates:
+# {name} / {Name} are filled in per file, literal braces are doubled.
+# Each entry's "fill" is the template's bound str.format.
+_REACT_TEMPLATE = """import React from 'react';
+
+const {Name} = () => {{
+  return (
+    <div>
+      <h1>{name}</h1>
+    </div>
+  );
+}};
+
+export default {Name};
+"""
+
+_API_TEMPLATE = """from fastapi import APIRouter
+
+router = APIRouter()
+
+@router.get("/{name}")
+async def get_{name}():
+    \"\"\"Get {name}.\"\"\"
+    return {{"message": "{name}"}}
+
+@router.post("/{name}")
+async def create_{name}(data: dict):
+    \"\"\"Create {name}.\"\"\"
+    return {{"message": "Created", "data": data}}
+"""
+
+_MODEL_TEMPLATE = """from pydantic import BaseModel
+from typing import Optional
+
+class {Name}(BaseModel):
+    \"\"\"{name} model.\"\"\"
+    id: Optional[int] = None
+    name: str
+    
+    class Config:
+        orm_mode = True
+"""
+
+_GENERIC_TEMPLATE = """\"\"\"
+{name} component
+\"\"\"
+
+class {Name}:
+    \"\"\"{name} class.\"\"\"
+    
+    def __init__(self):
+        pass
+"""
+
+_TEMPLATES = {
+    "react_component": {
+        "name": "React Component",
+        "fill": _REACT_TEMPLATE.format,
+        "extension": ".jsx"
+    },
+    "api_endpoint": {
+        "name": "API Endpoint",
+        "fill": _API_TEMPLATE.format,
+        "extension": ".py"
+    },
+    "data_model": {
+        "name": "Data Model",
+        "fill": _MODEL_TEMPLATE.format,
+        "extension": ".py"
+    },
+    "generic_component": {
+        "name": "Generic Component",
+        "fill": _GENERIC_TEMPLATE.format,
+        "extension": ".py"
+    }
+}
+
+
+@lru_cache(maxsize=1024)
+def _component_type_for(component_type: str) -> str:
+    """Map a requested component type to a template key (memoized - a pure function of the text)."""
+    component_lower = component_type.lower()
+    
+    if any(word in component_lower for word in ["react", "component", "jsx"]):
+        return "react_component"
+    elif any(word in component_lower for word in ["vue", "sfc"]):
+        return "vue_component"
+    elif any(word in component_lower for word in ["api", "endpoint", "route"]):
+        return "api_endpoint"
+    elif any(word in component_lower for word in ["model", "schema", "entity"]):
+        return "data_model"
+    else:
+        return "generic_component"
+
+
 class CodeGenerationHandler:
     """Handles code generation following Claude Code logic."""
     
@@ -101,67 +198,27 @@ class CodeGenerationHandler:
     
     def _detect_component_type(self, component_type: str, name: str, context: Optional[Dict]) -> str:
         """Detect component type from specification."""
-        component_lower = component_type.lower()
-        
-        if any(word in component_lower for word in ["react", "component", "jsx"]):
-            return "react_component"
-        elif any(word in component_lower for word in ["vue", "sfc"]):
-            return "vue_component"
-        elif any(word in component_lower for word in ["api", "endpoint", "route"]):
-            return "api_endpoint"
-        elif any(word in component_lower for word in ["model", "schema", "entity"]):
-            return "data_model"
-        else:
-            return "generic_component"
+        return _component_type_for(component_type)
     
     def _select_template(self, component_type: str, framework: Optional[str], context: Optional[Dict]) -> Dict[str, Any]:
-        """Select appropriate template."""
-        templates = {
-            "react_component": {
-                "name": "React Component",
-                "content": self._react_template(),
-                "extension": ".jsx"
-            },
-            "api_endpoint": {
-                "name": "API Endpoint",
-                "content": self._api_template(),
-                "extension": ".py"
-            },
-            "data_model": {
-                "name": "Data Model",
-                "content": self._model_template(),
-                "extension": ".py"
-            },
-            "generic_component": {
-                "name": "Generic Component",
-                "content": self._generic_template(),
-                "extension": ".py"
-            }
-        }
-        
-        return templates.get(component_type, templates["generic_component"])
+        """Select appropriate template (shared - read only)."""
+        return _TEMPLATES.get(component_type, _TEMPLATES["generic_component"])
     
     def _generate_files(self, name: str, template: Dict, component_type: str, context: Optional[Dict]) -> List[str]:
         """Generate files for component."""
-        files = []
-        
-        # Generate main file
+        # Main file
         file_name = f"{name}{template['extension']}"
-        content = template["content"].replace("{name}", name).replace("{Name}", name.capitalize())
+        content = template["fill"](name=name, Name=name.capitalize())
+        to_create = [(file_name, content)]
         
-        result = self.file_handler.create_file(file_name, content, context)
-        if result["success"]:
-            files.append(file_name)
-        
-        # Generate test file if needed
+        # Test file if needed
         if component_type in ["react_component", "api_endpoint"]:
             test_file = f"{name}_test{template['extension']}"
-            test_content = self._generate_test_content(name, component_type)
-            result = self.file_handler.create_file(test_file, test_content, context)
-            if result["success"]:
-                files.append(test_file)
+            to_create.append((test_file, self._generate_test_content(name, component_type)))
         
-        return files
+        # Write them in one batch
+        results = self.file_handler.create_files(to_create, context)
+        return [path for (path, _), result in zip(to_create, results) if result["success"]]
     
     def _analyze_function(self, function_spec: Dict) -> Dict[str, Any]:
         """Analyze function specification."""
@@ -221,77 +278,15 @@ class CodeGenerationHandler:
         properties = members.get("properties", [])
         methods = members.get("methods", [])
         
-        code = f"class {class_name}:\n"
-        code += '    """Class docstring."""\n\n'
+        parts = [f"class {class_name}:\n", '    """Class docstring."""\n\n']
         
         # Properties
-        for prop in properties:
-            code += f"    {prop} = None\n\n"
+        parts.extend(f"    {prop} = None\n\n" for prop in properties)
         
         # Methods
-        for method in methods:
-            code += f"    def {method}(self):\n        pass\n\n"
+        parts.extend(f"    def {method}(self):\n        pass\n\n" for method in methods)
         
-        return code
-    
-    def _react_template(self) -> str:
-        """React component template."""
-        return """import React from 'react';
-
-const {Name} = () => {
-  return (
-    <div>
-      <h1>{name}</h1>
-    </div>
-  );
-};
-
-export default {Name};
-"""
-    
-    def _api_template(self) -> str:
-        """API endpoint template."""
-        return """from fastapi import APIRouter
-
-router = APIRouter()
-
-@router.get("/{name}")
-async def get_{name}():
-    \"\"\"Get {name}.\"\"\"
-    return {{"message": "{name}"}}
-
-@router.post("/{name}")
-async def create_{name}(data: dict):
-    \"\"\"Create {name}.\"\"\"
-    return {{"message": "Created", "data": data}}
-"""
-    
-    def _model_template(self) -> str:
-        """Data model template."""
-        return """from pydantic import BaseModel
-from typing import Optional
-
-class {Name}(BaseModel):
-    \"\"\"{name} model.\"\"\"
-    id: Optional[int] = None
-    name: str
-    
-    class Config:
-        orm_mode = True
-"""
-    
-    def _generic_template(self) -> str:
-        """Generic component template."""
-        return """\"\"\"
-{name} component
-\"\"\"
-
-class {Name}:
-    \"\"\"{name} class.\"\"\"
-    
-    def __init__(self):
-        pass
-"""
+        return "".join(parts)
     
     def _generate_test_content(self, name: str, component_type: str) -> str:
         """Generate test file content."""
@@ -305,13 +300,16 @@ def test_{name}():
 """
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _code_handler = None
+_code_handler_lock = threading.Lock()
 
 def get_code_handler() -> CodeGenerationHandler:
     """Get or create global code generation handler."""
     global _code_handler
     if _code_handler is None:
-        _code_handler = CodeGenerationHandler()
+        with _code_handler_lock:
+            if _code_handler is None:
+                _code_handler = CodeGenerationHandler()
     return _code_handler
 
@@ -4,10 +4,28 @@ Implements Section 1 of Claude Code Comprehensive Logic Plan
 """
 
 from typing import Dict, List, Any, Optional, Tuple
+import os
 import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 
 
+# Classifications kept in CommandRecognizer.command_history (oldest dropped first)
+COMMAND_HISTORY_LIMIT = int(os.getenv("MYDESKAI_COMMAND_HISTORY", "256"))
+
+# Distinct normalized inputs whose text analysis is memoized
+ANALYSIS_CACHE_SIZE = 1024
+
+# Path and extension patterns, compiled once at import. Callers skip a scan
+# when the text lacks the pattern's required "." or "/" (a C-level check).
+_FILE_PATH_RE = re.compile(r'[\w/\\]+\.\w+')
+_DIR_PATH_RE = re.compile(r'[\w/\\]+/')
+_EXT_RE = re.compile(r'\.\w+')
+
+
 class IntentType(Enum):
     """Types of user intents."""
     EXPLICIT_COMMAND = "explicit"
@@ -24,31 +42,54 @@ class IntentType(Enum):
     TERMINAL = "terminal"
 
 
+@dataclass(slots=True)
+class ContextInfo:
+    """Context facts for one classified input (a fixed-shape slotted record, not a dict)."""
+    has_context: bool
+    current_directory: Optional[str]
+    project_type: Optional[str]
+    recent_operations: List[Any]
+    file_extensions: List[str]
+    detected_paths: List[str]
+
+
 class CommandRecognizer:
     """
     Recognizes and classifies user commands using the Claude Code logic framework.
     """
     
-    # Explicit command patterns
+    # Explicit command patterns (compiled once; matched against lowercased input)
     EXPLICIT_PATTERNS = {
-        "create": r"\b(create|make|new|add)\s+",
-        "read": r"\b(read|show|display|view|open|cat)\s+",
-        "write": r"\b(write|save|update|modify|edit|change)\s+",
-        "delete": r"\b(delete|remove|rm|del)\s+",
-        "run": r"\b(run|execute|start|launch)\s+",
-        "test": r"\b(test|spec|check)\s+",
-        "init": r"\b(init|initialize|setup|bootstrap)\s+",
-        "fix": r"\b(fix|debug|repair|resolve)\s+",
+        "create": re.compile(r"\b(create|make|new|add)\s+"),
+        "read": re.compile(r"\b(read|show|display|view|open|cat)\s+"),
+        "write": re.compile(r"\b(write|save|update|modify|edit|change)\s+"),
+        "delete": re.compile(r"\b(delete|remove|rm|del)\s+"),
+        "run": re.compile(r"\b(run|execute|start|launch)\s+"),
+        "test": re.compile(r"\b(test|spec|check)\s+"),
+        "init": re.compile(r"\b(init|initialize|setup|bootstrap)\s+"),
+        "fix": re.compile(r"\b(fix|debug|repair|resolve)\s+"),
     }
     
     # Implicit request patterns
     IMPLICIT_PATTERNS = {
-        "need": r"\b(need|want|require|should have)\s+",
-        "problem": r"\b(problem|issue|error|bug|broken|not working)\s+",
-        "improve": r"\b(improve|better|optimize|enhance|refactor)\s+",
-        "add": r"\b(add|implement|include)\s+",
+        "need": re.compile(r"\b(need|want|require|should have)\s+"),
+        "problem": re.compile(r"\b(problem|issue|error|bug|broken|not working)\s+"),
+        "improve": re.compile(r"\b(improve|better|optimize|enhance|refactor)\s+"),
+        "add": re.compile(r"\b(add|implement|include)\s+"),
     }
     
+    # Each pattern family as one alternation with a named group per command,
+    # so a single scan finds every command that matches
+    EXPLICIT_COMBINED = re.compile("|".join(
+        f"(?P<{name}>{pattern.pattern})" for name, pattern in EXPLICIT_PATTERNS.items()
+    ))
+    IMPLICIT_COMBINED = re.compile("|".join(
+        f"(?P<{name}>{pattern.pattern})" for name, pattern in IMPLICIT_PATTERNS.items()
+    ))
+    
+    # Case-insensitive copy for slash commands, which are classified without lowercasing
+    EXPLICIT_COMBINED_ANY_CASE = re.compile(EXPLICIT_COMBINED.pattern, re.IGNORECASE)
+    
     # File operation indicators
     FILE_INDICATORS = [
         "file", "directory", "folder", "path", ".py", ".js", ".ts", ".md",
@@ -73,9 +114,29 @@ class CommandRecognizer:
         "where is", "show me", "list"
     ]
     
+    # Operation types in priority order, each with one regex over its indicators.
+    # Indicators match as substrings ("files" counts as "file"), so the
+    # alternations are unanchored; each check is a single scan in C.
+    OPERATION_TYPE_PATTERNS = [
+        (operation_type, re.compile("|".join(map(re.escape, indicators))))
+        for operation_type, indicators in [
+            ("file_operation", FILE_INDICATORS),
+            ("code_operation", CODE_INDICATORS),
+            ("git_operation", GIT_INDICATORS),
+            ("search", SEARCH_INDICATORS),
+            ("terminal", ["run", "execute", "command", "bash", "shell"]),
+        ]
+    ]
+    OPERATION_TYPE_PATTERNS_ANY_CASE = [
+        (operation_type, re.compile(pattern.pattern, re.IGNORECASE))
+        for operation_type, pattern in OPERATION_TYPE_PATTERNS
+    ]
+    
     def __init__(self):
         """Initialize the command recognizer."""
-        self.command_history = []
+        self.command_history = deque(maxlen=COMMAND_HISTORY_LIMIT)
+        self._analyze = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._analyze_text)
+        self._analyze_slash = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._analyze_slash_text)
     
     def classify_input(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -88,27 +149,32 @@ class CommandRecognizer:
         Returns:
             Classification result with intent, confidence, and metadata
         """
-        input_lower = user_input.lower().strip()
-        
-        # Character analysis
-        starts_with_slash = input_lower.startswith('/')
-        
-        # Intent classification
-        intent = self._determine_intent(input_lower, starts_with_slash)
-        
-        # Confidence scoring
-        confidence = self._calculate_confidence(input_lower, intent)
-        
-        # Operation type detection
-        operation_type = self._detect_operation_type(input_lower)
-        
-        # Context evaluation
-        context_info = self._evaluate_context(input_lower, context)
+        text = user_input.strip()
+        
+        # Slash commands are explicit with full confidence: checked first, and
+        # classified without lowercasing or the command pattern scan
+        if text.startswith('/'):
+            intent, confidence = IntentType.EXPLICIT_COMMAND, 1.0
+            operation_type, command = self._analyze_slash(text)
+            context_info = self._evaluate_context(text, context)
+            if context_info.file_extensions:
+                context_info.file_extensions = [ext.lower() for ext in context_info.file_extensions]
+        else:
+            # Strip first so surrounding whitespace is never case-converted.
+            # str.lower() has an ASCII fast path; a translate() table is slower.
+            input_lower = text.lower()
+            
+            # Intent, confidence and operation type depend only on the text
+            intent, confidence, operation_type, command = self._analyze(input_lower)
+            
+            # Context evaluation
+            context_info = self._evaluate_context(input_lower, context)
         
         result = {
             "intent": intent,
             "confidence": confidence,
             "operation_type": operation_type,
+            "command": command,
             "input": user_input,
             "context": context_info,
             "requires_clarification": confidence < 0.4,
@@ -118,20 +184,62 @@ class CommandRecognizer:
         self.command_history.append(result)
         return result
     
-    def _determine_intent(self, input_lower: str, starts_with_slash: bool) -> IntentType:
+    def _analyze_text(self, input_lower: str) -> Tuple[IntentType, float, Optional[str], Optional[str]]:
+        """
+        Classify normalized input text (memoized per instance as _analyze).
+        
+        Args:
+            input_lower: Lowercased, stripped user input (never a slash command)
+            
+        Returns:
+            (intent, confidence, operation type, explicit command or None)
+        """
+        operation_type = self._detect_operation_type(input_lower)
+        
+        # Command pattern matches, shared by intent and confidence
+        matches = self._scan(input_lower)
+        
+        # Intent classification
+        intent = self._determine_intent(input_lower, starts_with_slash=False, matches=matches)
+        
+        # Confidence scoring
+        confidence = self._calculate_confidence(intent, matches)
+        
+        return intent, confidence, operation_type, self._first_command(matches["explicit"])
+    
+    def _analyze_slash_text(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Operation type and command name of a slash command (memoized per instance as _analyze_slash).
+        
+        Args:
+            text: Stripped user input starting with "/", in its original case
+            
+        Returns:
+            (operation type, explicit command or None)
+        """
+        operation_type = self._detect_operation_type(text, self.OPERATION_TYPE_PATTERNS_ANY_CASE)
+        command = self._first_command(self._matched_commands(self.EXPLICIT_COMBINED_ANY_CASE, text))
+        return operation_type, command
+    
+    def _scan(self, input_lower: str) -> Dict[str, set]:
+        """Match both command pattern families once, for all classification steps."""
+        return {
+            "explicit": self._matched_commands(self.EXPLICIT_COMBINED, input_lower),
+            "implicit": self._matched_commands(self.IMPLICIT_COMBINED, input_lower),
+        }
+    
+    def _determine_intent(self, input_lower: str, starts_with_slash: bool, matches: Dict[str, set]) -> IntentType:
         """Determine the primary intent of the input."""
         if starts_with_slash:
             return IntentType.EXPLICIT_COMMAND
         
         # Check explicit patterns
-        for pattern in self.EXPLICIT_PATTERNS.values():
-            if re.search(pattern, input_lower):
-                return IntentType.EXPLICIT_COMMAND
+        if matches["explicit"]:
+            return IntentType.EXPLICIT_COMMAND
         
         # Check implicit patterns
-        for pattern in self.IMPLICIT_PATTERNS.values():
-            if re.search(pattern, input_lower):
-                return IntentType.IMPLICIT_REQUEST
+        if matches["implicit"]:
+            return IntentType.IMPLICIT_REQUEST
         
         # Check specific intents
         if "init" in input_lower or "initialize" in input_lower or "setup" in input_lower:
@@ -149,19 +257,17 @@ class CommandRecognizer:
         # Default to ambiguous if unclear
         return IntentType.AMBIGUOUS
     
-    def _calculate_confidence(self, input_lower: str, intent: IntentType) -> float:
+    def _calculate_confidence(self, intent: IntentType, matches: Dict[str, set]) -> float:
         """Calculate confidence score for the classification."""
-        if intent == IntentType.EXPLICIT_COMMAND:
+        if intent is IntentType.EXPLICIT_COMMAND:
             return 1.0
         
-        if intent == IntentType.AMBIGUOUS:
+        if intent is IntentType.AMBIGUOUS:
             return 0.3
         
         # Count matching patterns
-        explicit_matches = sum(1 for pattern in self.EXPLICIT_PATTERNS.values() 
-                             if re.search(pattern, input_lower))
-        implicit_matches = sum(1 for pattern in self.IMPLICIT_PATTERNS.values() 
-                              if re.search(pattern, input_lower))
+        explicit_matches = len(matches["explicit"])
+        implicit_matches = len(matches["implicit"])
         
         if explicit_matches > 0:
             return min(0.8, 0.6 + (explicit_matches * 0.1))
@@ -171,48 +277,43 @@ class CommandRecognizer:
         
         return 0.5
     
-    def _detect_operation_type(self, input_lower: str) -> Optional[str]:
-        """Detect the type of operation requested."""
-        # File operations
-        if any(indicator in input_lower for indicator in self.FILE_INDICATORS):
-            return "file_operation"
-        
-        # Code operations
-        if any(indicator in input_lower for indicator in self.CODE_INDICATORS):
-            return "code_operation"
-        
-        # Git operations
-        if any(indicator in input_lower for indicator in self.GIT_INDICATORS):
-            return "git_operation"
-        
-        # Search operations
-        if any(indicator in input_lower for indicator in self.SEARCH_INDICATORS):
-            return "search"
-        
-        # Terminal operations
-        if any(word in input_lower for word in ["run", "execute", "command", "bash", "shell"]):
-            return "terminal"
+    def _detect_operation_type(self, input_lower: str, patterns: Optional[List[Tuple[str, re.Pattern]]] = None) -> Optional[str]:
+        """Detect the type of operation requested (patterns default to the lowercase-input set)."""
+        for operation_type, pattern in patterns or self.OPERATION_TYPE_PATTERNS:
+            if pattern.search(input_lower):
+                return operation_type
         
         return None
     
-    def _evaluate_context(self, input_lower: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    def _matched_commands(self, combined: re.Pattern, input_lower: str) -> set:
+        """Names of the patterns in a combined alternation that match anywhere in the input."""
+        return {match.lastgroup for match in combined.finditer(input_lower)}
+    
+    def _first_command(self, matched: set) -> Optional[str]:
+        """The matched explicit command that comes first in EXPLICIT_PATTERNS, if any."""
+        for cmd in self.EXPLICIT_PATTERNS:
+            if cmd in matched:
+                return cmd
+        return None
+    
+    def _evaluate_context(self, input_lower: str, context: Optional[Dict[str, Any]]) -> ContextInfo:
         """Evaluate context for the command."""
-        context_info = {
-            "has_context": context is not None,
-            "current_directory": context.get("current_directory") if context else None,
-            "project_type": context.get("project_type") if context else None,
-            "recent_operations": context.get("recent_operations", []) if context else [],
-        }
-        
         # Detect file extensions in input
-        file_extensions = re.findall(r'\.\w+', input_lower)
-        context_info["file_extensions"] = file_extensions
-        
-        # Detect paths
-        paths = re.findall(r'[\w/\\]+\.\w+', input_lower)
-        context_info["detected_paths"] = paths
-        
-        return context_info
+        file_extensions = _EXT_RE.findall(input_lower)
+        
+        # Detect paths (every path ends in an extension, so none without one)
+        paths = _FILE_PATH_RE.findall(input_lower) if file_extensions else []
+        
+        if context is None:
+            return ContextInfo(False, None, None, [], file_extensions, paths)
+        return ContextInfo(
+            has_context=True,
+            current_directory=context.get("current_directory"),
+            project_type=context.get("project_type"),
+            recent_operations=context.get("recent_operations", []),
+            file_extensions=file_extensions,
+            detected_paths=paths,
+        )
     
     def _determine_routing(self, confidence: float) -> str:
         """Determine how to route the command based on confidence."""
@@ -223,43 +324,65 @@ class CommandRecognizer:
         else:
             return "present_options_menu"
     
-    def extract_parameters(self, user_input: str, intent: IntentType) -> Dict[str, Any]:
-        """Extract parameters from the user input."""
+    def extract_parameters(self, user_input: str, intent: IntentType,
+                           classification: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Extract parameters from the user input.
+        
+        Args:
+            user_input: The user's input string
+            intent: Intent from classify_input
+            classification: classify_input's result for this input, if at hand -
+                its extensions and command are reused instead of rescanning
+            
+        Returns:
+            Extracted file/directory paths, extensions and command name
+        """
         params = {}
-        input_lower = user_input.lower()
+        # Only needed when there is no classification to reuse
+        input_lower = user_input.lower() if classification is None else None
         
         # Extract file paths
-        file_paths = re.findall(r'[\w/\\]+\.\w+', user_input)
+        file_paths = _FILE_PATH_RE.findall(user_input) if "." in user_input else []
         if file_paths:
             params["file_paths"] = file_paths
         
         # Extract directory paths
-        dir_paths = re.findall(r'[\w/\\]+/', user_input)
+        dir_paths = _DIR_PATH_RE.findall(user_input) if "/" in user_input else []
         if dir_paths:
             params["directory_paths"] = dir_paths
         
         # Extract file extensions
-        extensions = re.findall(r'\.\w+', input_lower)
+        if classification is not None:
+            extensions = classification["context"].file_extensions
+        else:
+            extensions = _EXT_RE.findall(input_lower)
         if extensions:
-            params["file_extensions"] = list(set(extensions))
+            # Ordered de-duplication: deterministic, first occurrence first
+            params["file_extensions"] = list(dict.fromkeys(extensions))
         
         # Extract command names (for explicit commands)
-        if intent == IntentType.EXPLICIT_COMMAND:
-            for cmd, pattern in self.EXPLICIT_PATTERNS.items():
-                if re.search(pattern, input_lower):
-                    params["command"] = cmd
-                    break
+        if intent is IntentType.EXPLICIT_COMMAND:
+            if classification is not None:
+                command = classification["command"]
+            else:
+                command = self._first_command(self._matched_commands(self.EXPLICIT_COMBINED, input_lower))
+            if command:
+                params["command"] = command
         
         return params
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _command_recognizer = None
+_command_recognizer_lock = threading.Lock()
 
 def get_command_recognizer() -> CommandRecognizer:
     """Get or create the global command recognizer instance."""
     global _command_recognizer
     if _command_recognizer is None:
-        _command_recognizer = CommandRecognizer()
+        with _command_recognizer_lock:
+            if _command_recognizer is None:
+                _command_recognizer = CommandRecognizer()
     return _command_recognizer
 
@@ -3,10 +3,23 @@ Decision Engine - Implements Claude Code decision trees and routing logic
 Combines command recognition with tool selection for intelligent routing
 """
 
+import threading
+from functools import cached_property, lru_cache
 from typing import Dict, List, Any, Optional
+from lazy_imports import lazy_import
 from command_recognizer import get_command_recognizer, IntentType
-from tool_selection_matrix import get_tool_matrix
-from tool_selector import get_tool_selector
+
+# Both pull in the tool registry (CrewAI tools, LangChain); load them on first use
+tool_selection_matrix = lazy_import("tool_selection_matrix")
+tool_selector = lazy_import("tool_selector")
+
+
+# Number of context-free decisions memoized by process_request_cached
+DECISION_CACHE_SIZE = 2048
+
+# Task types that are always low complexity / that can fan out in parallel
+LOW_COMPLEXITY_FILE_TASKS = frozenset({"read_file", "create_single_file"})
+PARALLEL_TASK_TYPES = frozenset({"create_multiple_files", "complex_search"})
 
 
 class DecisionEngine:
@@ -16,10 +29,23 @@ class DecisionEngine:
     """
     
     def __init__(self):
-        """Initialize the decision engine."""
-        self.command_recognizer = get_command_recognizer()
-        self.tool_matrix = get_tool_matrix()
-        self.tool_selector = get_tool_selector()
+        """Initialize the decision engine (components are created on first use)."""
+        self._cached_decision = lru_cache(maxsize=DECISION_CACHE_SIZE)(self.process_request)
+    
+    @cached_property
+    def command_recognizer(self):
+        """The shared command recognizer."""
+        return get_command_recognizer()
+    
+    @cached_property
+    def tool_matrix(self):
+        """The shared tool selection matrix."""
+        return tool_selection_matrix.get_tool_matrix()
+    
+    @cached_property
+    def tool_selector(self):
+        """The shared intelligent tool selector."""
+        return tool_selector.get_tool_selector()
     
     def process_request(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -38,7 +64,8 @@ class DecisionEngine:
         # Step 2: Extract Parameters
         params = self.command_recognizer.extract_parameters(
             user_input, 
-            classification["intent"]
+            classification["intent"],
+            classification
         )
         
         # Step 3: Determine Task Type
@@ -67,7 +94,7 @@ class DecisionEngine:
             "classification": classification,
             "parameters": params,
             "task_type": task_type,
-            "selected_tools": [tool.name if hasattr(tool, 'name') else str(type(tool).__name__) for tool in tools],
+            "selected_tools": [getattr(tool, 'name', type(tool).__name__) for tool in tools],
             "tools": tools,  # Actual tool instances
             "execution_strategy": execution_strategy,
             "requires_confirmation": classification["confidence"] < 0.8,
@@ -76,6 +103,27 @@ class DecisionEngine:
         
         return result
     
+    def process_request_cached(self, user_input: str) -> Dict[str, Any]:
+        """
+        Memoized process_request for requests without context.
+        
+        The decision is a pure function of the input text, so repeated
+        requests skip classification and tool selection. The returned dict
+        is shared between callers and must not be mutated. The key is the
+        exact input: extracted parameters (file paths) are case-sensitive.
+        
+        Args:
+            user_input: User's input/request
+            
+        Returns:
+            Complete decision result with routing, tools, and execution plan
+        """
+        return self._cached_decision(user_input)
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized decisions."""
+        self._cached_decision.cache_clear()
+    
     def _determine_execution_strategy(self, classification: Dict, task_type: Optional[str], tools: List[Any]) -> Dict[str, Any]:
         """Determine the execution strategy based on the decision."""
         intent = classification["intent"]
@@ -91,7 +139,7 @@ class DecisionEngine:
         }
         
         # Determine complexity
-        if operation_type == "file_operation" and task_type in ["read_file", "create_single_file"]:
+        if operation_type == "file_operation" and task_type in LOW_COMPLEXITY_FILE_TASKS:
             strategy["estimated_complexity"] = "low"
         elif operation_type == "code_operation" or task_type == "generate_code":
             strategy["estimated_complexity"] = "medium"
@@ -99,19 +147,22 @@ class DecisionEngine:
             strategy["estimated_complexity"] = "high"
         
         # Check if parallel execution is possible
-        if task_type in ["create_multiple_files", "complex_search"]:
+        if task_type in PARALLEL_TASK_TYPES:
             strategy["parallel_possible"] = True
         
         return strategy
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _decision_engine = None
+_decision_engine_lock = threading.Lock()
 
 def get_decision_engine() -> DecisionEngine:
     """Get or create the global decision engine instance."""
     global _decision_engine
     if _decision_engine is None:
-        _decision_engine = DecisionEngine()
+        with _decision_engine_lock:
+            if _decision_engine is None:
+                _decision_engine = DecisionEngine()
     return _decision_engine
 
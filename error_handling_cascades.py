@@ -5,6 +5,10 @@ Implements error classification, recovery strategies, and cascading failure mana
 
 from typing import Dict, List, Any, Optional
 from enum import Enum
+from collections import deque
+import os
+import re
+import threading
 import traceback
 
 
@@ -16,12 +20,38 @@ class ErrorSeverity(Enum):
     LOW = "low"
 
 
+# Error records kept in ErrorHandler.error_history (oldest dropped first)
+ERROR_HISTORY_LIMIT = int(os.getenv("MYDESKAI_ERROR_HISTORY", "1024"))
+
+# Severity by exception type name
+_TYPE_SEVERITY = {
+    "SystemError": ErrorSeverity.CRITICAL,
+    "MemoryError": ErrorSeverity.CRITICAL,
+    "OSError": ErrorSeverity.CRITICAL,
+    "RuntimeError": ErrorSeverity.HIGH,
+    "ValueError": ErrorSeverity.HIGH,
+    "KeyError": ErrorSeverity.HIGH,
+    "AttributeError": ErrorSeverity.MEDIUM,
+    "TypeError": ErrorSeverity.MEDIUM,
+    "ImportError": ErrorSeverity.MEDIUM,
+}
+
+# Message keywords (matched as substrings of the lowercased message)
+_CRITICAL_KEYWORDS_RE = re.compile("system|security|breach|corrupt")
+_HIGH_KEYWORDS_RE = re.compile("build|crash|fatal")
+
+
 class ErrorHandler:
     """Handles errors following Claude Code logic cascades."""
     
-    def __init__(self):
-        """Initialize error handler."""
-        self.error_history = []
+    def __init__(self, max_history: int = ERROR_HISTORY_LIMIT):
+        """
+        Initialize error handler.
+        
+        Args:
+            max_history: Maximum number of error records to keep (oldest are dropped)
+        """
+        self.error_history = deque(maxlen=max_history)
         self.recovery_strategies = {
             ErrorSeverity.CRITICAL: self._critical_recovery,
             ErrorSeverity.HIGH: self._high_recovery,
@@ -49,14 +79,19 @@ class ErrorHandler:
         # Execute recovery
         recovery_result = self._execute_recovery(recovery, error, context)
         
-        # Log error
+        # Log error - records keep plain text only (no frames or locals stay alive).
+        # Only severe errors pay for the full stack; the rest keep the exception line.
+        if severity is ErrorSeverity.CRITICAL or severity is ErrorSeverity.HIGH:
+            tb = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        else:
+            tb = "".join(traceback.format_exception_only(type(error), error))
         error_record = {
             "error": str(error),
             "type": type(error).__name__,
             "severity": severity.value,
             "recovery": recovery_result,
             "context": context,
-            "traceback": traceback.format_exc()
+            "traceback": tb
         }
         self.error_history.append(error_record)
         
@@ -96,29 +131,23 @@ class ErrorHandler:
     
     def _assess_severity(self, error: Exception, context: Optional[Dict]) -> ErrorSeverity:
         """Assess error severity."""
-        error_type = type(error).__name__
         error_str = str(error).lower()
         
-        # Critical errors
-        if any(keyword in error_str for keyword in ["system", "security", "breach", "corrupt"]):
-            return ErrorSeverity.CRITICAL
-        
-        if error_type in ["SystemError", "MemoryError", "OSError"]:
+        # Critical keywords outrank the exception type
+        if _CRITICAL_KEYWORDS_RE.search(error_str):
             return ErrorSeverity.CRITICAL
         
-        # High severity
-        if error_type in ["RuntimeError", "ValueError", "KeyError"]:
-            return ErrorSeverity.HIGH
+        # Critical and high severity types
+        type_severity = _TYPE_SEVERITY.get(type(error).__name__)
+        if type_severity is ErrorSeverity.CRITICAL or type_severity is ErrorSeverity.HIGH:
+            return type_severity
         
-        if any(keyword in error_str for keyword in ["build", "crash", "fatal"]):
+        # High severity keywords outrank medium severity types
+        if _HIGH_KEYWORDS_RE.search(error_str):
             return ErrorSeverity.HIGH
         
-        # Medium severity
-        if error_type in ["AttributeError", "TypeError", "ImportError"]:
-            return ErrorSeverity.MEDIUM
-        
-        # Low severity (default)
-        return ErrorSeverity.LOW
+        # Medium severity types, else low severity (default)
+        return type_severity or ErrorSeverity.LOW
     
     def _determine_recovery_strategy(self, severity: ErrorSeverity, error: Exception, context: Optional[Dict]) -> Dict[str, Any]:
         """Determine recovery strategy."""
@@ -227,13 +256,17 @@ class ErrorHandler:
         return {"action": "continue", "can_continue": True}
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _error_handler = None
+_error_handler_lock = threading.Lock()
+
 
 def get_error_handler() -> ErrorHandler:
     """Get or create global error handler."""
     global _error_handler
     if _error_handler is None:
-        _error_handler = ErrorHandler()
+        with _error_handler_lock:
+            if _error_handler is None:
+                _error_handler = ErrorHandler()
     return _error_handler
 
@@ -0,0 +1,102 @@
+"""
+Exact Cache - Exact-match response replay
+Stores final answers keyed by SHA-256(model, task type, request) so identical
+low-complexity requests skip agent construction and the LLM call entirely.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+DEFAULT_EXACT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".mydeskai", "response_cache.sqlite3")
+
+# Seconds a stored answer may be replayed, and rows kept (newest first)
+EXACT_CACHE_TTL = int(os.getenv("MYDESKAI_EXACT_CACHE_TTL", str(24 * 60 * 60)))
+EXACT_CACHE_MAX_ROWS = int(os.getenv("MYDESKAI_EXACT_CACHE_MAX_ROWS", "10000"))
+
+# Part of every key - bump when prompts, tools or answer formatting change so
+# answers produced by the old behaviour stop being replayed
+EXACT_CACHE_VERSION = "1"
+
+
+class ExactCache:
+    """Thread-safe SQLite store of exact request -> response pairs."""
+
+    def __init__(self, path: Optional[str] = None, ttl: int = EXACT_CACHE_TTL, max_rows: int = EXACT_CACHE_MAX_ROWS):
+        """
+        Initialize the exact-match cache.
+
+        Args:
+            path: SQLite database path (":memory:" for a process-local cache)
+            ttl: Seconds after which a stored response is no longer served
+            max_rows: Responses kept; the oldest are evicted on write
+        """
+        self.path = path or os.getenv("MYDESKAI_EXACT_CACHE", DEFAULT_EXACT_CACHE_PATH)
+        self.ttl = ttl
+        self.max_rows = max_rows
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, value BLOB NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_ts ON responses (ts)")
+        self._conn.commit()
+
+    def make_key(self, request: str, task_type: Optional[str], model_name: str) -> str:
+        """Build the SHA-256 key for a request."""
+        return hashlib.sha256(f"{EXACT_CACHE_VERSION}|{model_name}|{task_type}|{request}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response for a key, or None on a miss or expired response."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND ts >= ?", (key, int(time.time()) - self.ttl)
+            ).fetchone()
+        if row is None:
+            return None
+        value = row[0]
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, model_name: str, value: Any) -> None:
+        """Store (or replace) the response for a key, evicting expired and excess rows."""
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, ts) VALUES (?, ?, ?, ?)",
+                (key, model_name, str(value).encode("utf-8"), now)
+            )
+            self._conn.execute("DELETE FROM responses WHERE ts < ?", (now - self.ttl,))
+            # rowid grows with every insert/replace, so it orders rows by last write
+            self._conn.execute(
+                "DELETE FROM responses WHERE rowid <= (SELECT rowid FROM responses ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                (self.max_rows,)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all stored responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+# Global instance - built once; the lock is only taken while building it
+_exact_cache = None
+_exact_cache_lock = threading.Lock()
+
+def get_exact_cache() -> ExactCache:
+    """Get or create global exact-match cache."""
+    global _exact_cache
+    if _exact_cache is None:
+        with _exact_cache_lock:
+            if _exact_cache is None:
+                _exact_cache = ExactCache()
+    return _exact_cache
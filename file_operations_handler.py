@@ -4,11 +4,27 @@ Handles all file system operations with safety checks and validation
 """
 
 import os
-from typing import Dict, List, Any, Optional
+import shutil
+import stat
+import tempfile
+import threading
+from operator import ne
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from tools_registry import FileReadTool, FileWriterTool, DirectoryReadTool
 
 
+# Chunk size (characters) used when counting changed characters
+_COMPARE_BLOCK = 4096
+
+# ASCII characters other than "\n" that str.splitlines() treats as line breaks
+# ("\r" never survives a text-mode read)
+_OTHER_ASCII_LINE_BREAKS = ("\x0b", "\x0c", "\x1c", "\x1d", "\x1e")
+
+# Path prefixes whose files are critical to delete (str.startswith accepts the tuple)
+_SYSTEM_PATH_PREFIXES = ("/System", "/usr", "/bin", "/sbin", "/etc")
+
+
 class FileOperationsHandler:
     """Handles file operations following Claude Code logic chains."""
     
@@ -36,7 +52,34 @@ class FileOperationsHandler:
         """
         # PATH RESOLUTION
         resolved_path = self._resolve_path(file_path, context)
+        return self._create_resolved(resolved_path, content, make_parent=True)
+    
+    def create_files(self, files: List[Tuple[str, str]], context: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """
+        Create several files in one call, following Section 2.1 per file.
+        
+        Parent directories are checked once per distinct directory instead
+        of once per file.
+        
+        Args:
+            files: (file_path, content) pairs
+            context: Optional context
+            
+        Returns:
+            One result dictionary per file, in order
+        """
+        # PATH RESOLUTION
+        resolved = [(self._resolve_path(file_path, context), content) for file_path, content in files]
         
+        # DIRECTORY CHECK
+        for parent_dir in {os.path.dirname(path) for path, _ in resolved}:
+            if parent_dir and not os.path.exists(parent_dir):
+                os.makedirs(parent_dir, exist_ok=True)
+        
+        return [self._create_resolved(path, content, make_parent=False) for path, content in resolved]
+    
+    def _create_resolved(self, resolved_path: str, content: str, make_parent: bool) -> Dict[str, Any]:
+        """Create a file at an already resolved path (existence check, validation, write)."""
         # EXISTENCE CHECK
         if os.path.exists(resolved_path):
             return {
@@ -48,7 +91,7 @@ class FileOperationsHandler:
         
         # DIRECTORY CHECK
         parent_dir = os.path.dirname(resolved_path)
-        if parent_dir and not os.path.exists(parent_dir):
+        if make_parent and parent_dir and not os.path.exists(parent_dir):
             os.makedirs(parent_dir, exist_ok=True)
         
         # CONTENT GENERATION & VALIDATION
@@ -85,14 +128,17 @@ class FileOperationsHandler:
         """
         resolved_path = self._resolve_path(file_path, context)
         
-        if not os.path.exists(resolved_path):
+        # One stat for both checks (exists + isfile)
+        try:
+            st = os.stat(resolved_path)
+        except (OSError, ValueError):
             return {
                 "success": False,
                 "error": "File not found",
                 "path": resolved_path
             }
         
-        if not os.path.isfile(resolved_path):
+        if not stat.S_ISREG(st.st_mode):
             return {
                 "success": False,
                 "error": "Path is not a file",
@@ -108,7 +154,7 @@ class FileOperationsHandler:
                 "path": resolved_path,
                 "content": content,
                 "size": len(content),
-                "lines": len(content.splitlines())
+                "lines": self._count_lines(content)
             }
         except Exception as e:
             return {
@@ -117,6 +163,12 @@ class FileOperationsHandler:
                 "path": resolved_path
             }
     
+    def _count_lines(self, content: str) -> int:
+        """Count lines as len(content.splitlines()) would, without building the list."""
+        if not content.isascii() or any(brk in content for brk in _OTHER_ASCII_LINE_BREAKS):
+            return len(content.splitlines())
+        return content.count("\n") + (not content.endswith("\n") if content else 0)
+    
     def modify_file(self, file_path: str, modifications: Dict[str, Any], context: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Modify a file following Section 2.2 logic.
@@ -152,14 +204,12 @@ class FileOperationsHandler:
         
         # Write modified content
         try:
-            # Backup original
+            # Backup original (byte-for-byte copy, reflinked where the filesystem supports it)
             backup_path = f"{resolved_path}.bak"
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                f.write(original_content)
+            shutil.copy2(resolved_path, backup_path)
             
-            # Write modified
-            with open(resolved_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
+            # Write modified to a temp file and swap it in atomically
+            self._write_atomic(resolved_path, modified_content)
             
             return {
                 "success": True,
@@ -220,11 +270,49 @@ class FileOperationsHandler:
                 "path": resolved_path
             }
     
+    def _write_atomic(self, resolved_path: str, content: str) -> None:
+        """
+        Replace a file's content via a unique temp file and os.replace.
+        
+        Symlinks are followed, so the real file is replaced rather than the
+        link. Permission bits, extended attributes and (where permitted) owner
+        are carried over. A file with other hard links is rewritten in place,
+        since replacing it would detach this name from the shared inode.
+        """
+        real_path = os.path.realpath(resolved_path)
+        st = os.stat(real_path)
+        if st.st_nlink > 1:
+            with open(real_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            return
+        
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(real_path),
+            prefix=f".{os.path.basename(real_path)}.",
+            suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            shutil.copystat(real_path, tmp_path)
+            # copystat also copies the old timestamps; the content is new
+            os.utime(tmp_path)
+            try:
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+            except (AttributeError, PermissionError):
+                pass
+            os.replace(tmp_path, real_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
     def _resolve_path(self, file_path: str, context: Optional[Dict]) -> str:
         """Resolve file path (absolute, relative, or inferred)."""
         if os.path.isabs(file_path):
             return file_path
         
+        # Requests carry the working directory in their context, so getcwd is only a fallback
         if context and "current_directory" in context:
             return os.path.join(context["current_directory"], file_path)
         
@@ -250,19 +338,22 @@ class FileOperationsHandler:
             old, new = modifications["replace"]
             modified = modified.replace(old, new)
         
+        # Line insertion, append and prepend all join pieces with "\n", so the
+        # result is assembled by a single join instead of one copy per step
         if "insert_at_line" in modifications:
             line_num, new_content = modifications["insert_at_line"]
-            lines = modified.splitlines()
-            lines.insert(line_num - 1, new_content)
-            modified = "\n".join(lines)
+            segments = modified.splitlines()
+            segments.insert(line_num - 1, new_content)
+        else:
+            segments = [modified]
         
         if "append" in modifications:
-            modified += "\n" + modifications["append"]
+            segments.append(modifications["append"])
         
         if "prepend" in modifications:
-            modified = modifications["prepend"] + "\n" + modified
+            segments.insert(0, modifications["prepend"])
         
-        return modified
+        return segments[0] if len(segments) == 1 else "\n".join(segments)
     
     def _validate_modification(self, original: str, modified: str, file_path: str) -> Dict[str, Any]:
         """Validate file modification."""
@@ -276,7 +367,8 @@ class FileOperationsHandler:
         # Count changes
         changes = {
             "lines_added": len(modified.splitlines()) - len(original.splitlines()),
-            "chars_changed": sum(1 for a, b in zip(original, modified) if a != b)
+            "chars_changed": self._count_chars_changed(original, modified),
+            "size_delta": len(modified) - len(original)
         }
         
         return {
@@ -284,14 +376,29 @@ class FileOperationsHandler:
             "changes": changes
         }
     
+    def _count_chars_changed(self, original: str, modified: str) -> int:
+        """Count positions where original and modified differ (over their common length)."""
+        if original == modified:
+            return 0
+        
+        # Identical blocks are skipped with a single C-level comparison;
+        # differing blocks are counted with map() rather than a Python loop
+        common = min(len(original), len(modified))
+        changed = 0
+        for start in range(0, common, _COMPARE_BLOCK):
+            end = min(start + _COMPARE_BLOCK, common)
+            old_block, new_block = original[start:end], modified[start:end]
+            if old_block != new_block:
+                changed += sum(map(ne, old_block, new_block))
+        return changed
+    
     def _assess_deletion_risk(self, file_path: str) -> Dict[str, Any]:
         """Assess risk of deleting a file."""
         risk_level = "low"
         reasons = []
         
         # Check if system file
-        system_paths = ["/System", "/usr", "/bin", "/sbin", "/etc"]
-        if any(file_path.startswith(sp) for sp in system_paths):
+        if file_path.startswith(_SYSTEM_PATH_PREFIXES):
             risk_level = "critical"
             reasons.append("System file")
         
@@ -311,13 +418,17 @@ class FileOperationsHandler:
         }
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _file_handler = None
+_file_handler_lock = threading.Lock()
+
 
 def get_file_handler() -> FileOperationsHandler:
     """Get or create global file operations handler."""
     global _file_handler
     if _file_handler is None:
-        _file_handler = FileOperationsHandler()
+        with _file_handler_lock:
+            if _file_handler is None:
+                _file_handler = FileOperationsHandler()
     return _file_handler
 
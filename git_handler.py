@@ -4,30 +4,46 @@ Handles all Git operations with safety checks
 """
 
 import os
+import re
 import subprocess
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 
+# Splits `git diff` output into one chunk per file
+_DIFF_SPLIT_RE = re.compile(r"^(?=diff --git )", re.MULTILINE)
+
+
 class GitHandler:
     """Handles Git operations following Claude Code logic."""
     
     def __init__(self):
         """Initialize Git handler."""
-        pass
+        # repo_path -> ((.git/index mtime, .git/HEAD mtime), state)
+        self._state_cache: Dict[str, Tuple[Tuple[Optional[int], Optional[int]], Dict[str, Any]]] = {}
     
-    def check_repository_state(self, path: Optional[str] = None) -> Dict[str, Any]:
+    def check_repository_state(self, path: Optional[str] = None, use_cache: bool = False) -> Dict[str, Any]:
         """
         Check repository state following Section 5.1 logic.
         
         Args:
             path: Repository path (defaults to current directory)
+            use_cache: Reuse the last state while .git/index and .git/HEAD are
+                unchanged. Working tree edits that have not touched the index
+                are not picked up, so only use it where that is acceptable.
             
         Returns:
             Repository state information
         """
         repo_path = path or os.getcwd()
         
+        if use_cache:
+            stamp = self._git_stamp(repo_path)
+            cached = self._state_cache.get(repo_path)
+            if cached is not None and stamp is not None and cached[0] == stamp:
+                return cached[1]
+        
         # Is Git initialized?
         git_dir = os.path.join(repo_path, ".git")
         is_initialized = os.path.exists(git_dir)
@@ -39,19 +55,22 @@ class GitHandler:
                 "suggestion": "Run 'git init' to initialize"
             }
         
-        # Working tree status
-        status = self._get_status(repo_path)
-        
-        # Branch information
-        branch_info = self._get_branch_info(repo_path)
+        # Working tree status and branch information
+        status, branch_info = self._get_state(repo_path)
         
-        return {
+        state = {
             "initialized": True,
             "path": repo_path,
             "status": status,
             "branch": branch_info,
             "clean": status.get("clean", False)
         }
+        
+        stamp = self._git_stamp(repo_path)
+        if stamp is not None:
+            self._state_cache[repo_path] = (stamp, state)
+        
+        return state
     
     def create_commit(self, message: Optional[str] = None, files: Optional[List[str]] = None, context: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -68,7 +87,7 @@ class GitHandler:
         repo_path = context.get("path") if context else os.getcwd()
         
         # Check repository state
-        state = self.check_repository_state(repo_path)
+        state = self.check_repository_state(repo_path, use_cache=True)
         if not state["initialized"]:
             return {
                 "success": False,
@@ -84,8 +103,11 @@ class GitHandler:
         
         # Stage changes
         if files:
-            for file in files:
-                self._run_git_command(repo_path, ["add", file])
+            # One git process for all files; if git rejects any path it stages
+            # nothing, so fall back to adding files one at a time
+            if not self._run_git_command(repo_path, ["add", "--"] + list(files))["success"]:
+                for file in files:
+                    self._run_git_command(repo_path, ["add", file])
         else:
             self._run_git_command(repo_path, ["add", "."])
         
@@ -139,43 +161,54 @@ class GitHandler:
             "conflict_info": conflict_info
         }
     
-    def _get_status(self, repo_path: str) -> Dict[str, Any]:
-        """Get git status."""
-        result = self._run_git_command(repo_path, ["status", "--porcelain"])
+    def _git_stamp(self, repo_path: str) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        """Get the (.git/index, .git/HEAD) mtimes, or None if HEAD cannot be stat'ed."""
+        git_dir = os.path.join(repo_path, ".git")
+        try:
+            head_mtime = os.stat(os.path.join(git_dir, "HEAD")).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            index_mtime = os.stat(os.path.join(git_dir, "index")).st_mtime_ns
+        except OSError:
+            # Fresh repository without an index yet
+            index_mtime = None
+        return (index_mtime, head_mtime)
+    
+    def _get_state(self, repo_path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Get git status and branch information from a single git status call."""
+        result = self._run_git_command(repo_path, ["status", "--branch", "--porcelain"])
         
         if not result["success"]:
-            return {"clean": False, "error": result.get("error")}
+            return (
+                {"clean": False, "error": result.get("error")},
+                {"current": "unknown", "remote_info": ""}
+            )
         
-        output = result.get("output", "")
-        has_changes = bool(output.strip())
+        lines = result.get("output", "").splitlines()
+        header = lines[0][3:] if lines and lines[0].startswith("## ") else ""
+        changes = lines[1:] if header else lines
         
-        return {
-            "clean": not has_changes,
-            "changes": output.splitlines() if has_changes else []
-        }
-    
-    def _get_branch_info(self, repo_path: str) -> Dict[str, Any]:
-        """Get branch information."""
-        branch_result = self._run_git_command(repo_path, ["branch", "--show-current"])
-        remote_result = self._run_git_command(repo_path, ["branch", "-vv"])
+        # Header forms: "main...origin/main [ahead 1]", "main", "HEAD (no branch)",
+        # "No commits yet on main"
+        if header.startswith("HEAD (no branch)"):
+            current, remote_info = "", ""
+        elif header.startswith(("No commits yet on ", "Initial commit on ")):
+            current, remote_info = header.rsplit(" on ", 1)[1], ""
+        else:
+            current, _, remote_info = header.partition("...")
+            current = current.split(" ", 1)[0]
         
-        return {
-            "current": branch_result.get("output", "").strip() if branch_result["success"] else "unknown",
-            "remote_info": remote_result.get("output", "").strip() if remote_result["success"] else ""
-        }
+        return (
+            {"clean": not changes, "changes": changes},
+            {"current": current, "remote_info": remote_info}
+        )
     
     def _analyze_changes(self, repo_path: str, files: Optional[List[str]]) -> Dict[str, Any]:
         """Analyze changes for commit."""
         if files:
             # Analyze specific files
-            changes = []
-            for file in files:
-                diff_result = self._run_git_command(repo_path, ["diff", file])
-                if diff_result["success"]:
-                    changes.append({
-                        "file": file,
-                        "diff": diff_result.get("output", "")
-                    })
+            changes = self._diff_files(repo_path, files)
         else:
             # Analyze all changes
             diff_result = self._run_git_command(repo_path, ["diff", "--cached"])
@@ -186,6 +219,64 @@ class GitHandler:
             "changes": changes
         }
     
+    def _diff_files(self, repo_path: str, files: List[str]) -> List[Dict[str, Any]]:
+        """
+        Diff each of files against the index using a single git diff call.
+        
+        Args:
+            repo_path: Repository root
+            files: Files (or directories) relative to repo_path, or absolute
+            
+        Returns:
+            List of {"file", "diff"} entries in the order of files
+        """
+        diff_result = self._run_git_command(repo_path, ["diff", "--"] + list(files))
+        if not diff_result["success"]:
+            return self._diff_files_one_by_one(repo_path, files)
+        
+        # Repository-relative path -> diff chunk
+        chunks: Dict[str, str] = {}
+        for chunk in _DIFF_SPLIT_RE.split(diff_result.get("output", "")):
+            header = chunk.split("\n", 1)[0]
+            paths = header[len("diff --git a/"):]
+            # Unquoted, unrenamed header: "diff --git a/<path> b/<path>"
+            half = (len(paths) - 3) // 2
+            if header.startswith("diff --git a/") and paths[half:half + 3] == " b/" and paths[:half] == paths[half + 3:]:
+                chunks[paths[:half]] = chunk
+            elif chunk:
+                # Quoted or renamed paths - let git attribute them per file
+                return self._diff_files_one_by_one(repo_path, files)
+        
+        root = os.path.abspath(repo_path)
+        changes = []
+        for file in files:
+            target = os.path.relpath(os.path.join(root, file), root).replace(os.sep, "/")
+            if target == ".":
+                matched = list(chunks.values())
+            else:
+                prefix = target + "/"
+                matched = [chunk for path, chunk in chunks.items() if path == target or path.startswith(prefix)]
+            
+            if matched or os.path.exists(os.path.join(root, file)):
+                changes.append({"file": file, "diff": "".join(matched)})
+            else:
+                # Missing files are skipped if git rejects them
+                changes.extend(self._diff_files_one_by_one(repo_path, [file]))
+        
+        return changes
+    
+    def _diff_files_one_by_one(self, repo_path: str, files: List[str]) -> List[Dict[str, Any]]:
+        """Diff files with one git diff call each, skipping files git rejects."""
+        changes = []
+        for file in files:
+            diff_result = self._run_git_command(repo_path, ["diff", file])
+            if diff_result["success"]:
+                changes.append({
+                    "file": file,
+                    "diff": diff_result.get("output", "")
+                })
+        return changes
+    
     def _generate_commit_message(self, changes: Dict[str, Any]) -> str:
         """Generate commit message following conventional commits."""
         file_count = changes.get("files_changed", 0)
@@ -241,13 +332,17 @@ class GitHandler:
             }
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _git_handler = None
+_git_handler_lock = threading.Lock()
+
 
 def get_git_handler() -> GitHandler:
     """Get or create global Git handler."""
     global _git_handler
     if _git_handler is None:
-        _git_handler = GitHandler()
+        with _git_handler_lock:
+            if _git_handler is None:
+                _git_handler = GitHandler()
     return _git_handler
 
@@ -3,6 +3,7 @@ Handler Dispatcher - Unified interface to all Claude Code handlers
 Routes requests to appropriate handlers based on operation type
 """
 
+import threading
 from typing import Dict, List, Any, Optional
 from decision_engine import get_decision_engine
 from file_operations_handler import get_file_handler
@@ -142,13 +143,16 @@ class HandlerDispatcher:
         return self.terminal_handler.execute_command(command, context, confirmed=False)
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _dispatcher = None
+_dispatcher_lock = threading.Lock()
 
 def get_dispatcher() -> HandlerDispatcher:
     """Get or create global handler dispatcher."""
     global _dispatcher
     if _dispatcher is None:
-        _dispatcher = HandlerDispatcher()
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = HandlerDispatcher()
     return _dispatcher
 
@@ -0,0 +1,40 @@
+"""
+Lazy Imports - Deferred module loading
+Registers heavyweight modules (crewai, agents, ...) so they are only executed
+on first attribute access, keeping import-time cost off cache-only paths.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module lazily using importlib.util.LazyLoader.
+
+    The module object is registered in sys.modules immediately, but its
+    code only runs the first time one of its attributes is accessed.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        The (possibly not yet executed) module
+
+    Raises:
+        ImportError: If the module cannot be found
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{name}'")
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
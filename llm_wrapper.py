@@ -4,7 +4,14 @@ This module wraps litellm so that crewai thinks it's a standard LangChain LLM.
 This solves the primary blocker from the original plan.
 """
 
-from typing import Any, List, Optional
+import asyncio
+import atexit
+import importlib.util
+import os
+import queue
+import threading
+from typing import Any, AsyncIterator, Coroutine, Dict, Iterator, List, Optional, TypeVar
+import httpx
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_core.outputs import ChatGeneration, ChatResult
@@ -12,6 +19,115 @@ from langchain_core.callbacks.manager import CallbackManagerForLLMRun
 import litellm
 
 
+# Shared HTTP connection pool so provider calls reuse TCP/TLS connections
+HTTP_POOL_SIZE = int(os.getenv("MYDESKAI_HTTP_POOL_SIZE", "16"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("MYDESKAI_HTTP_KEEPALIVE_EXPIRY", "60"))  # seconds; outlives a chat turn's think time
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None  # httpx needs h2 for HTTP/2
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=HTTP_POOL_SIZE,
+    max_keepalive_connections=HTTP_POOL_SIZE,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+)
+_HTTP_TIMEOUT = httpx.Timeout(60.0)
+
+T = TypeVar("T")
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+# litellm.aclient_session is process-global and an httpx.AsyncClient is bound to
+# one event loop, so all async LLM calls run on a single long-lived loop (on a
+# daemon thread) that owns the pooled AsyncClient; other loops hand work to it.
+_llm_loop: Optional[asyncio.AbstractEventLoop] = None
+_llm_loop_lock = threading.Lock()
+
+# End of a stream bridged from the LLM loop to another thread or loop
+_STREAM_END = object()
+
+
+def _use_shared_http_client() -> None:
+    """Point litellm at the process-wide pooled httpx.Client."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(http2=HTTP2_AVAILABLE, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+                litellm.client_session = _http_client
+
+
+async def _new_async_http_client() -> httpx.AsyncClient:
+    """Create the pooled httpx.AsyncClient on the loop that will use it."""
+    return httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+
+
+def _close_llm_loop() -> None:
+    """Close the pooled httpx.AsyncClient and stop the LLM loop (at interpreter exit)."""
+    loop = _llm_loop
+    if loop is None or not loop.is_running():
+        return
+    client = litellm.aclient_session
+    if isinstance(client, httpx.AsyncClient):
+        try:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+        except Exception:
+            pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def get_llm_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get (starting on first use) the event loop that runs all async LLM calls.
+    
+    Returns:
+        The shared LLM event loop
+    """
+    global _llm_loop
+    if _llm_loop is None:
+        with _llm_loop_lock:
+            if _llm_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-event-loop", daemon=True).start()
+                litellm.aclient_session = asyncio.run_coroutine_threadsafe(_new_async_http_client(), loop).result()
+                atexit.register(_close_llm_loop)
+                _llm_loop = loop
+    return _llm_loop
+
+
+def run_on_llm_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the shared LLM loop and block until it finishes.
+    
+    Must not be called from the LLM loop itself.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    loop = get_llm_loop()
+    if _running_loop() is loop:
+        coro.close()
+        raise RuntimeError("run_on_llm_loop() called from the LLM loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the event loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _await_on_llm_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """Await a coroutine on the shared LLM loop from whichever loop the caller runs on."""
+    loop = get_llm_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
 class LiteLLMWrapper(BaseChatModel):
     """
     A wrapper class that makes litellm compatible with crewai's LangChain-based architecture.
@@ -66,34 +182,10 @@ class LiteLLMWrapper(BaseChatModel):
                     # Default to user message for other types
                     litellm_messages.append({"role": "user", "content": str(msg.content)})
             
-            # Prepare parameters for litellm
-            # litellm automatically reads API keys from environment variables:
-            # - GEMINI_API_KEY for Gemini models
-            # - OPENAI_API_KEY for OpenAI models
-            params = {
-                "model": self.model_name,
-                "messages": litellm_messages,
-                "temperature": self.temperature,
-            }
-            
-            # Add API base URL if provided (for custom endpoints)
-            if self.api_base:
-                params["api_base"] = self.api_base
-            
-            # Add API key if explicitly provided (otherwise litellm reads from env)
-            if self.api_key:
-                params["api_key"] = self.api_key
-            
-            if self.max_tokens:
-                params["max_tokens"] = self.max_tokens
-            
-            if stop:
-                params["stop"] = stop
-            
-            # Merge any additional kwargs
-            params.update(kwargs)
+            params = self._build_params(litellm_messages, stop, **kwargs)
             
             # Call litellm
+            _use_shared_http_client()
             response = litellm.completion(**params)
             
             # Extract the text from the response
@@ -110,6 +202,190 @@ class LiteLLMWrapper(BaseChatModel):
         except Exception as e:
             raise Exception(f"Error calling litellm with model {self.model_name}: {str(e)}")
     
+    def chat(self, messages: List[Dict[str, str]], stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        """
+        Send litellm-format messages and return the reply text.
+        
+        Synchronous counterpart of achat for one-shot calls that do not need
+        an agent/tool loop.
+        
+        Args:
+            messages: List of {"role": ..., "content": ...} dicts
+            stop: Optional list of stop sequences
+            **kwargs: Additional arguments to pass to litellm
+            
+        Returns:
+            The generated message content
+        """
+        params = self._build_params(messages, stop, **kwargs)
+        
+        _use_shared_http_client()
+        try:
+            response = litellm.completion(**params)
+        except Exception as e:
+            raise Exception(f"Error calling litellm with model {self.model_name}: {str(e)}")
+        
+        if response and response.choices:
+            return response.choices[0].message.content or ""
+        return ""
+    
+    async def achat(self, messages: List[Dict[str, str]], stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        """
+        Asynchronously send litellm-format messages and return the reply text.
+        
+        Uses litellm.acompletion so several calls can be awaited concurrently
+        (e.g. with asyncio.gather) instead of blocking on each round-trip.
+        
+        Args:
+            messages: List of {"role": ..., "content": ...} dicts
+            stop: Optional list of stop sequences
+            **kwargs: Additional arguments to pass to litellm
+            
+        Returns:
+            The generated message content
+        """
+        params = self._build_params(messages, stop, **kwargs)
+        return await _await_on_llm_loop(self._acomplete(params))
+    
+    async def _acomplete(self, params: Dict[str, Any]) -> str:
+        """Call litellm.acompletion (on the LLM loop) and return the reply text."""
+        try:
+            response = await litellm.acompletion(**params)
+        except Exception as e:
+            raise Exception(f"Error calling litellm with model {self.model_name}: {str(e)}")
+        
+        if response and response.choices:
+            return response.choices[0].message.content or ""
+        return ""
+    
+    async def astream_chat(self, messages: List[Dict[str, str]], stop: Optional[List[str]] = None, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Asynchronously stream the reply text as it is generated.
+        
+        Streaming counterpart of achat: yields content deltas from
+        litellm.acompletion(stream=True) so callers can show the first
+        tokens without waiting for the whole reply.
+        
+        Args:
+            messages: List of {"role": ..., "content": ...} dicts
+            stop: Optional list of stop sequences
+            **kwargs: Additional arguments to pass to litellm
+            
+        Yields:
+            Non-empty chunks of the generated message content
+        """
+        params = self._build_params(messages, stop, stream=True, **kwargs)
+        loop = get_llm_loop()
+        caller = asyncio.get_running_loop()
+        if caller is loop:
+            async for delta in self._astream(params):
+                yield delta
+            return
+        
+        # Produce on the LLM loop, consume on the caller's loop
+        deltas: asyncio.Queue = asyncio.Queue()
+        
+        def put(item: Any) -> None:
+            caller.call_soon_threadsafe(deltas.put_nowait, item)
+        
+        future = asyncio.run_coroutine_threadsafe(self._pump_stream(params, put), loop)
+        try:
+            while True:
+                item = await deltas.get()
+                if item is _STREAM_END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+    
+    def stream_chat(self, messages: List[Dict[str, str]], stop: Optional[List[str]] = None, **kwargs: Any) -> Iterator[str]:
+        """
+        Stream the reply text to a synchronous caller as it is generated.
+        
+        The request runs on the shared LLM loop; chunks are handed to the
+        calling thread, so slow consumers never block that loop. Must not be
+        called from the LLM loop itself.
+        
+        Args:
+            messages: List of {"role": ..., "content": ...} dicts
+            stop: Optional list of stop sequences
+            **kwargs: Additional arguments to pass to litellm
+            
+        Yields:
+            Non-empty chunks of the generated message content
+        """
+        params = self._build_params(messages, stop, stream=True, **kwargs)
+        loop = get_llm_loop()
+        if _running_loop() is loop:
+            raise RuntimeError("stream_chat() called from the LLM loop; use astream_chat instead")
+        
+        deltas: "queue.Queue[Any]" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._pump_stream(params, deltas.put), loop)
+        try:
+            while True:
+                item = deltas.get()
+                if item is _STREAM_END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+    
+    async def _pump_stream(self, params: Dict[str, Any], put) -> None:
+        """Feed _astream's chunks, then an exception or _STREAM_END, to put (on the LLM loop)."""
+        try:
+            async for delta in self._astream(params):
+                put(delta)
+        except Exception as e:
+            put(e)
+        else:
+            put(_STREAM_END)
+    
+    async def _astream(self, params: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield content deltas from litellm.acompletion(stream=True) (on the LLM loop)."""
+        try:
+            response = await litellm.acompletion(**params)
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise Exception(f"Error calling litellm with model {self.model_name}: {str(e)}")
+    
+    def _build_params(self, messages: List[Dict[str, str]], stop: Optional[List[str]] = None, **kwargs: Any) -> Dict[str, Any]:
+        """Build the litellm.completion keyword arguments for a request."""
+        # litellm automatically reads API keys from environment variables:
+        # - GEMINI_API_KEY for Gemini models
+        # - OPENAI_API_KEY for OpenAI models
+        params = {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": self.temperature,
+        }
+        
+        # Add API base URL if provided (for custom endpoints)
+        if self.api_base:
+            params["api_base"] = self.api_base
+        
+        # Add API key if explicitly provided (otherwise litellm reads from env)
+        if self.api_key:
+            params["api_key"] = self.api_key
+        
+        if self.max_tokens:
+            params["max_tokens"] = self.max_tokens
+        
+        if stop:
+            params["stop"] = stop
+        
+        # Merge any additional kwargs
+        params.update(kwargs)
+        return params
+    
     @property
     def _identifying_params(self) -> dict:
         """Return identifying parameters."""
@@ -3,6 +3,7 @@ Meta-Logic & Continuous Improvement - Section 12 of Claude Code Plan
 Implements task prioritization, learning, and self-evaluation
 """
 
+import threading
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from collections import defaultdict
@@ -212,13 +213,16 @@ class MetaLogic:
         return task_result.get("explanation_provided", True)
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _meta_logic = None
+_meta_logic_lock = threading.Lock()
 
 def get_meta_logic() -> MetaLogic:
     """Get or create global meta-logic instance."""
     global _meta_logic
     if _meta_logic is None:
-        _meta_logic = MetaLogic()
+        with _meta_logic_lock:
+            if _meta_logic is None:
+                _meta_logic = MetaLogic()
     return _meta_logic
 
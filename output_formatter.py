@@ -3,6 +3,7 @@ Output Formatter - Section 10 of Claude Code Plan
 Handles output formatting decisions and presentation
 """
 
+import threading
 from typing import Dict, List, Any, Optional
 from enum import Enum
 
@@ -169,13 +170,16 @@ class OutputFormatter:
         return str(content)
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _output_formatter = None
+_output_formatter_lock = threading.Lock()
 
 def get_output_formatter() -> OutputFormatter:
     """Get or create global output formatter."""
     global _output_formatter
     if _output_formatter is None:
-        _output_formatter = OutputFormatter()
+        with _output_formatter_lock:
+            if _output_formatter is None:
+                _output_formatter = OutputFormatter()
     return _output_formatter
 
@@ -0,0 +1,114 @@
+"""
+Plan Cache - Agentic plan reuse for the orchestrator
+Stores planner output keyed by a fingerprint of the request and decision so
+recurring requests can skip the planning LLM round-trip.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+
+DEFAULT_PLAN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".mydeskai", "plan_cache.sqlite3")
+
+# Seconds a stored plan may be reused, and rows kept (newest first)
+PLAN_CACHE_TTL = int(os.getenv("MYDESKAI_PLAN_CACHE_TTL", str(7 * 24 * 60 * 60)))
+PLAN_CACHE_MAX_ROWS = int(os.getenv("MYDESKAI_PLAN_CACHE_MAX_ROWS", "5000"))
+
+
+def normalize_request(request: str) -> str:
+    """Normalize a request so trivial whitespace/case differences share a key."""
+    return " ".join(request.lower().split())
+
+
+class PlanCache:
+    """
+    Exact-match plan cache backed by SQLite.
+
+    Plans from failed runs are quarantined (retrospection) so a bad plan
+    is never replayed.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: int = PLAN_CACHE_TTL, max_rows: int = PLAN_CACHE_MAX_ROWS):
+        """
+        Initialize the plan cache.
+
+        Args:
+            path: SQLite database path (":memory:" for a process-local cache)
+            ttl: Seconds after which a stored plan is no longer served
+            max_rows: Plans kept; the oldest are evicted on write
+        """
+        self.path = path or os.getenv("MYDESKAI_PLAN_CACHE", DEFAULT_PLAN_CACHE_PATH)
+        self.ttl = ttl
+        self.max_rows = max_rows
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plans ("
+            "key TEXT PRIMARY KEY, plan TEXT NOT NULL, "
+            "quarantined INTEGER NOT NULL DEFAULT 0, ts INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS plans_ts ON plans (ts)")
+        self._conn.commit()
+
+    def make_key(self, request: str, task_type: Optional[str], tool_names: Iterable[str], model_name: str) -> str:
+        """Build the SHA-256 fingerprint for a request/decision pair."""
+        fingerprint = f"{normalize_request(request)}|{task_type}|{sorted(tool_names)}|{model_name}"
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached plan for a key, or None on a miss, expired or quarantined plan."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT plan FROM plans WHERE key = ? AND quarantined = 0 AND ts >= ?",
+                (key, int(time.time()) - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, plan: Any) -> None:
+        """Store (or replace) the plan for a key, evicting expired and excess rows."""
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plans (key, plan, quarantined, ts) VALUES (?, ?, 0, ?)",
+                (key, str(plan), now)
+            )
+            self._conn.execute("DELETE FROM plans WHERE ts < ?", (now - self.ttl,))
+            # rowid grows with every insert/replace, so it orders rows by last write
+            self._conn.execute(
+                "DELETE FROM plans WHERE rowid <= (SELECT rowid FROM plans ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                (self.max_rows,)
+            )
+            self._conn.commit()
+
+    def quarantine(self, key: str) -> None:
+        """Mark a plan as coming from a failed run so it is no longer served."""
+        with self._lock:
+            self._conn.execute("UPDATE plans SET quarantined = 1 WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached plans."""
+        with self._lock:
+            self._conn.execute("DELETE FROM plans")
+            self._conn.commit()
+
+
+# Global instance - built once; the lock is only taken while building it
+_plan_cache = None
+_plan_cache_lock = threading.Lock()
+
+def get_plan_cache() -> PlanCache:
+    """Get or create global plan cache."""
+    global _plan_cache
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                _plan_cache = PlanCache()
+    return _plan_cache
@@ -6,6 +6,7 @@ Handles file search, code search, and analysis
 import os
 import re
 import glob
+import threading
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from tools_registry import DirectorySearchTool, FileReadTool
@@ -251,13 +252,16 @@ class SearchHandler:
         return min(1.0, score)
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _search_handler = None
+_search_handler_lock = threading.Lock()
 
 def get_search_handler() -> SearchHandler:
     """Get or create global search handler."""
     global _search_handler
     if _search_handler is None:
-        _search_handler = SearchHandler()
+        with _search_handler_lock:
+            if _search_handler is None:
+                _search_handler = SearchHandler()
     return _search_handler
 
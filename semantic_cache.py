@@ -0,0 +1,137 @@
+"""
+Semantic Cache - Embedding-based response reuse
+Serves a stored answer when a new request is semantically equivalent to one
+that was already answered (e.g. "What is X?" / "Explain X").
+Requires sentence-transformers and faiss; the cache is disabled without them.
+"""
+
+import threading
+import warnings
+from typing import Any, List, Optional, Tuple
+
+try:
+    import numpy as np
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    np = None
+    faiss = None
+    SentenceTransformer = None
+    SEMANTIC_CACHE_AVAILABLE = False
+
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+class SemanticCache:
+    """Caches (request, answer) pairs and looks them up by cosine similarity."""
+
+    def __init__(self, embedding_model: str = DEFAULT_EMBEDDING_MODEL, similarity_threshold: float = 0.9, max_entries: int = 1000):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embedding_model: sentence-transformers model used for embeddings
+            similarity_threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of cached pairs
+        """
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.enabled = SEMANTIC_CACHE_AVAILABLE
+
+        self._lock = threading.Lock()
+        self._encoder = None
+        self._index = None
+        self._vectors: List[Any] = []
+        self._entries: List[Tuple[str, str]] = []  # (model_name, answer)
+
+    def lookup(self, request: str, model_name: str, threshold: Optional[float] = None) -> Optional[str]:
+        """
+        Find a cached answer for a semantically equivalent request.
+
+        Args:
+            request: User request
+            model_name: Model the answer must have come from
+            threshold: Override for the similarity threshold
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        threshold = self.similarity_threshold if threshold is None else threshold
+        vector = self._embed(request)
+        if vector is None:
+            return None
+
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+            scores, ids = self._index.search(vector, min(5, self._index.ntotal))
+            for score, idx in zip(scores[0], ids[0]):
+                if score < threshold:
+                    break
+                entry_model, answer = self._entries[idx]
+                if entry_model == model_name:
+                    return answer
+        return None
+
+    def insert(self, request: str, model_name: str, answer: Any) -> None:
+        """Store the answer produced for a request."""
+        if not self.enabled:
+            return
+
+        vector = self._embed(request)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(vector.shape[1])
+
+            # IndexFlatIP has no removal - rebuild with the newest half when full
+            if len(self._entries) >= self.max_entries:
+                keep = self.max_entries // 2
+                self._vectors = self._vectors[-keep:]
+                self._entries = self._entries[-keep:]
+                self._index.reset()
+                self._index.add(np.vstack(self._vectors))
+
+            self._vectors.append(vector)
+            self._entries.append((model_name, str(answer)))
+            self._index.add(vector)
+
+    def clear(self) -> None:
+        """Remove all cached pairs."""
+        with self._lock:
+            self._vectors = []
+            self._entries = []
+            if self._index is not None:
+                self._index.reset()
+
+    def _embed(self, text: str) -> Optional[Any]:
+        """Embed text as a normalized float32 row vector."""
+        if self._encoder is None:
+            try:
+                self._encoder = SentenceTransformer(self.embedding_model)
+            except Exception as e:
+                warnings.warn(f"Semantic cache disabled - could not load {self.embedding_model}: {e}")
+                self.enabled = False
+                return None
+        return self._encoder.encode([text], normalize_embeddings=True).astype("float32")
+
+
+# Global instance - built once; the lock is only taken while building it
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create global semantic cache."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticCache()
+    return _semantic_cache
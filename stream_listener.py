@@ -0,0 +1,391 @@
+"""
+Stream Listener - CrewAI event streaming for the Streamlit dashboard
+Routes LLM stream chunks and agent/task/tool events to the UI of the
+request whose crew produced them.
+
+Lives outside app.py because Streamlit re-executes the app script on every
+rerun: sentinels, the context variable and the listener class defined here
+must keep their identity across reruns.
+"""
+
+import contextvars
+import queue
+import time
+from collections import deque
+from typing import Optional
+from crewai.events.event_bus import crewai_event_bus
+from crewai.events.base_event_listener import BaseEventListener
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+from crewai.events.types.agent_events import (
+    AgentExecutionStartedEvent,
+    AgentExecutionCompletedEvent,
+    AgentExecutionErrorEvent
+)
+from crewai.events.types.task_events import (
+    TaskStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent
+)
+from crewai.events.types.tool_usage_events import (
+    ToolUsageStartedEvent,
+    ToolUsageFinishedEvent,
+    ToolUsageErrorEvent
+)
+
+
+# Marks the end of a listener's chunk queue
+STREAM_END = object()
+
+# Asks coalesce_chunks to push its buffer now (a task finished - show its output promptly)
+STREAM_FLUSH = object()
+
+# Minimum seconds between streamed UI updates (~20 Hz regardless of token rate)
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Chunks queued per request before the producer waits for the UI to catch up
+STREAM_QUEUE_SIZE = 256
+
+# Seconds a producer waits on a full queue before treating the UI as gone
+STREAM_PUT_TIMEOUT = 5.0
+
+
+def coalesce_chunks(chunks: queue.Queue, interval: float = STREAM_FLUSH_INTERVAL):
+    """
+    Drain a chunk queue until STREAM_END, yielding buffered text at most once per interval.
+    
+    The first chunk after a quiet period is yielded immediately, so
+    time-to-first-token is unaffected. STREAM_FLUSH forces out the buffer
+    and separates the next task's output with a paragraph break.
+    
+    Args:
+        chunks: Queue of text chunks (and STREAM_FLUSH markers) terminated by STREAM_END
+        interval: Minimum seconds between yields
+        
+    Yields:
+        Joined text of the chunks received since the previous yield
+    """
+    buffer = []
+    last_flush = 0.0
+    while True:
+        # Block indefinitely while idle; otherwise wait only until the next flush is due
+        timeout = max(0.0, interval - (time.monotonic() - last_flush)) if buffer else None
+        try:
+            chunk = chunks.get(timeout=timeout)
+        except queue.Empty:
+            chunk = None
+        if chunk is STREAM_END:
+            break
+        force = chunk is STREAM_FLUSH
+        if force:
+            buffer.append("\n\n")
+        elif chunk is not None:
+            buffer.append(chunk)
+        if buffer and (force or time.monotonic() - last_flush >= interval):
+            yield "".join(buffer)
+            buffer.clear()
+            last_flush = time.monotonic()
+    
+    if buffer:
+        yield "".join(buffer)
+
+
+def split_completed_blocks(text: str):
+    """
+    Split streamed markdown into completed blocks and the unfinished tail.
+    
+    Blocks end at a blank line outside a code fence; the tail is everything
+    after the last such boundary.
+    
+    Returns:
+        (completed blocks or "", tail)
+    """
+    boundary = text.rfind("\n\n")
+    if boundary == -1:
+        return "", text
+    
+    # Fences before each candidate boundary, updated per step so the tail
+    # of a long open code block is scanned once rather than once per blank line
+    fences = text.count("```", 0, boundary)
+    while boundary != -1:
+        if fences % 2 == 0:
+            return text[:boundary], text[boundary + 2:]
+        previous = text.rfind("\n\n", 0, boundary)
+        fences -= text.count("```", max(previous, 0), boundary)
+        boundary = previous
+    return "", text
+
+
+def render_stream_blocks(placeholder, pieces) -> str:
+    """
+    Render streamed markdown so only the unfinished trailing block is re-sent.
+    
+    Completed blocks are written once into their own element; each update
+    re-renders just the short tail instead of the whole growing answer.
+    
+    Args:
+        placeholder: Placeholder to render into
+        pieces: Iterable of text pieces (e.g. from coalesce_chunks)
+        
+    Returns:
+        The full streamed text
+    """
+    area = placeholder.container()
+    tail = area.empty()
+    received = []
+    pending = ""
+    for piece in pieces:
+        received.append(piece)
+        completed, pending = split_completed_blocks(pending + piece)
+        if completed:
+            # The tail slot becomes permanent; later text goes into a new slot below it
+            tail.markdown(completed)
+            tail = area.empty()
+        if pending:
+            tail.markdown(pending)
+    return "".join(received)
+
+
+# Activity log entries shown per request, and the prefix for each entry level
+ACTIVITY_LOG_LIMIT = 20
+
+# Minimum seconds between activity log UI updates (completions and errors flush at once)
+LOG_FLUSH_INTERVAL = 0.25
+LOG_LEVEL_ICONS = {
+    "info": "ℹ️ ",
+    "success": "✅ ",
+    "error": "❌ ",
+}
+
+
+class StreamRun:
+    """Per-request streaming state: the chunk queue and the activity log shown for one request."""
+    
+    def __init__(self, log_container=None, stream: bool = True):
+        self.log_container = log_container
+        self.stream = stream  # False when nothing drains the chunks (batch runs)
+        self.chunks = queue.Queue(maxsize=STREAM_QUEUE_SIZE)  # Streamed text, drained by render_stream_blocks
+        self.activity_log = deque(maxlen=ACTIVITY_LOG_LIMIT)  # Newest pre-formatted log lines
+        self._log_dirty = False
+        self._last_log_flush = 0.0
+        self._abandoned = False
+    
+    def put_chunk(self, chunk):
+        """
+        Queue a text chunk or marker for the script thread.
+        
+        The queue is bounded, so a producer that outpaces the UI waits for it
+        instead of buffering without limit. If the queue stays full for
+        STREAM_PUT_TIMEOUT the reader is assumed gone (e.g. the script was
+        stopped) and later chunks are dropped rather than stalling the crew.
+        STREAM_END is always delivered, displacing queued text if need be
+        (the final answer is rendered in full afterwards).
+        
+        Args:
+            chunk: Text, STREAM_FLUSH or STREAM_END
+        """
+        if not self.stream:
+            return
+        if chunk is STREAM_END:
+            while True:
+                try:
+                    self.chunks.put_nowait(chunk)
+                    return
+                except queue.Full:
+                    try:
+                        self.chunks.get_nowait()
+                    except queue.Empty:
+                        pass
+        if self._abandoned:
+            return
+        try:
+            self.chunks.put(chunk, timeout=STREAM_PUT_TIMEOUT)
+        except queue.Full:
+            self._abandoned = True
+    
+    def add_log_entry(self, message: str, level: str = "info"):
+        """Add an entry to the activity log and update the UI."""
+        # Lines are formatted once on entry; the deque drops the oldest past the limit
+        self.activity_log.append(f"{LOG_LEVEL_ICONS.get(level, '')}{message}\n\n")
+        self._log_dirty = True
+        self.flush_log(force=level == "error")
+    
+    def flush_log(self, force: bool = True):
+        """
+        Push pending activity log entries to the log container.
+        
+        Unforced flushes are coalesced to one per LOG_FLUSH_INTERVAL, so a
+        burst of tool events produces a single UI update.
+        
+        Args:
+            force: Flush now regardless of when the log was last pushed
+        """
+        if not self.log_container or not self._log_dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_log_flush < LOG_FLUSH_INTERVAL:
+            return
+        self._log_dirty = False
+        self._last_log_flush = now
+        self.log_container.markdown("".join(self.activity_log))
+
+
+def preview(value, limit: int = 150) -> str:
+    """Shorten a (possibly large) event payload for the activity log, stringifying it only once."""
+    if value is None:
+        return ""
+    text = str(value)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+# The StreamRun whose crew is executing in the current thread/context
+current_stream_run: contextvars.ContextVar = contextvars.ContextVar("current_stream_run", default=None)
+
+
+class StreamlitStreamListener(BaseEventListener):
+    """
+    Event listener to capture streaming chunks and agent activity for Streamlit display.
+    
+    One instance is subscribed to the event bus per process (see
+    get_stream_listener in app.py). Handlers deliver events to the StreamRun set in
+    current_stream_run by the kickoff, so concurrent sessions each get their
+    own output. Events arriving outside any run's context (e.g. from threads
+    CrewAI starts for async_execution tasks) are dropped: there is no way to
+    tell which session they belong to.
+    """
+    
+    def __init__(self):
+        self.setup_listeners()
+    
+    def start_run(self, log_container=None, stream: bool = True) -> StreamRun:
+        """
+        Create the streaming state for a new request.
+        
+        Args:
+            log_container: Container the activity log is rendered into
+            stream: Whether the caller drains the run's chunk queue
+            
+        Returns:
+            The StreamRun to set in current_stream_run while its work runs
+        """
+        return StreamRun(log_container, stream)
+    
+    def _run(self) -> Optional[StreamRun]:
+        """The run the current event belongs to (None if it belongs to no known run)."""
+        return current_stream_run.get()
+    
+    def setup_listeners(self):
+        # Handlers receive the event source; `self` is the listener from the enclosing scope
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_llm_stream_chunk(source, event: LLMStreamChunkEvent):
+            """Handle each streaming chunk."""
+            run = self._run()
+            if run is None:
+                return
+            if event.chunk:
+                # Only the delta is queued; the script thread renders it
+                run.put_chunk(event.chunk)
+        
+        # Agent execution events
+        @crewai_event_bus.on(AgentExecutionStartedEvent)
+        def on_agent_started(source, event: AgentExecutionStartedEvent):
+            """Handle when an agent starts executing."""
+            run = self._run()
+            if run is None:
+                return
+            agent_name = getattr(event.agent, 'role', 'Unknown Agent')
+            message = f"🤖 **{agent_name}** started working on task"
+            run.add_log_entry(message, "info")
+        
+        @crewai_event_bus.on(AgentExecutionCompletedEvent)
+        def on_agent_completed(source, event: AgentExecutionCompletedEvent):
+            """Handle when an agent completes execution."""
+            run = self._run()
+            if run is None:
+                return
+            agent_name = getattr(event.agent, 'role', 'Unknown Agent')
+            output_preview = preview(event.output)
+            message = f"✅ **{agent_name}** completed task\n\n*Output preview: {output_preview}*"
+            run.add_log_entry(message, "success")
+            run.flush_log()
+        
+        @crewai_event_bus.on(AgentExecutionErrorEvent)
+        def on_agent_error(source, event: AgentExecutionErrorEvent):
+            """Handle when an agent encounters an error."""
+            run = self._run()
+            if run is None:
+                return
+            agent_name = getattr(event.agent, 'role', 'Unknown Agent')
+            message = f"❌ **{agent_name}** encountered an error: {event.error}"
+            run.add_log_entry(message, "error")
+        
+        # Task events
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event: TaskStartedEvent):
+            """Handle when a task starts."""
+            run = self._run()
+            if run is None:
+                return
+            task_name = getattr(event.task, 'description', 'Unknown Task')[:100] if event.task else "Unknown Task"
+            message = f"📋 Task started: *{task_name}*"
+            run.add_log_entry(message, "info")
+        
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event: TaskCompletedEvent):
+            """Handle when a task completes."""
+            run = self._run()
+            if run is None:
+                return
+            task_name = getattr(event.task, 'description', 'Unknown Task')[:100] if event.task else "Unknown Task"
+            output_preview = preview(event.output)
+            message = f"✅ Task completed: *{task_name}*\n\n*Output: {output_preview}*"
+            run.add_log_entry(message, "success")
+            run.flush_log()
+            run.put_chunk(STREAM_FLUSH)
+        
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event: TaskFailedEvent):
+            """Handle when a task fails."""
+            run = self._run()
+            if run is None:
+                return
+            task_name = getattr(event.task, 'description', 'Unknown Task')[:100] if event.task else "Unknown Task"
+            message = f"❌ Task failed: *{task_name}*\n\n*Error: {event.error}*"
+            run.add_log_entry(message, "error")
+        
+        # Tool usage events
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def on_tool_started(source, event: ToolUsageStartedEvent):
+            """Handle when a tool execution starts."""
+            run = self._run()
+            if run is None:
+                return
+            agent_role = event.agent_role or "Unknown Agent"
+            tool_name = event.tool_name
+            tool_args = str(event.tool_args)[:100] if event.tool_args else "No args"
+            message = f"🔧 **{agent_role}** using tool: `{tool_name}`\n*Input: {tool_args}*"
+            run.add_log_entry(message, "info")
+        
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_finished(source, event: ToolUsageFinishedEvent):
+            """Handle when a tool execution completes."""
+            run = self._run()
+            if run is None:
+                return
+            agent_role = event.agent_role or "Unknown Agent"
+            tool_name = event.tool_name
+            output_preview = preview(event.output)
+            cache_status = " (cached)" if event.from_cache else ""
+            message = f"✅ **{agent_role}** finished using `{tool_name}`{cache_status}\n*Output: {output_preview}*"
+            run.add_log_entry(message, "success")
+        
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def on_tool_error(source, event: ToolUsageErrorEvent):
+            """Handle when a tool execution encounters an error."""
+            run = self._run()
+            if run is None:
+                return
+            agent_role = event.agent_role or "Unknown Agent"
+            tool_name = event.tool_name
+            error_msg = str(event.error)[:200]
+            message = f"❌ **{agent_role}** error with tool `{tool_name}`: {error_msg}"
+            run.add_log_entry(message, "error")
@@ -6,6 +6,7 @@ Handles terminal command execution with safety checks
 import os
 import subprocess
 import shlex
+import threading
 from typing import Dict, List, Any, Optional
 import platform
 
@@ -196,13 +197,16 @@ class TerminalHandler:
         }
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _terminal_handler = None
+_terminal_handler_lock = threading.Lock()
 
 def get_terminal_handler() -> TerminalHandler:
     """Get or create global terminal handler."""
     global _terminal_handler
     if _terminal_handler is None:
-        _terminal_handler = TerminalHandler()
+        with _terminal_handler_lock:
+            if _terminal_handler is None:
+                _terminal_handler = TerminalHandler()
     return _terminal_handler
 
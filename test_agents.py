@@ -0,0 +1,60 @@
+"""
+Agent factory tests
+Checks that every factory call builds an independent Agent with the tools
+it was given.
+"""
+
+import sys
+from agents import create_file_reader_agent, create_test_agent
+from llm_wrapper import LiteLLMWrapper
+from tools_registry import get_tool_set
+
+
+def test_agents_are_isolated():
+    """Each call returns its own Agent, so per-run state is not shared."""
+    print("Testing agent isolation...")
+    llm = LiteLLMWrapper(model_name="gpt-3.5-turbo")
+    
+    first = create_test_agent(llm, "gpt-3.5-turbo")
+    second = create_test_agent(llm, "gpt-3.5-turbo")
+    
+    assert first is not second, "Callers must not share one Agent instance"
+    assert first.role == second.role
+    assert first.backstory == second.backstory
+    
+    # CrewAI sets per-run attributes such as crew while executing a task
+    first.crew = "crew-a"
+    assert second.crew != "crew-a", "Per-run state leaked between agents"
+    print("  ✅ Agents are independent\n")
+
+
+def test_explicit_tools_are_used():
+    """Agents built with different tool instances each get their own tools."""
+    print("Testing explicit tool sets...")
+    tools_a = get_tool_set("file_operations")
+    tools_b = get_tool_set("file_operations")
+    
+    llm = LiteLLMWrapper(model_name="gpt-3.5-turbo")
+    agent_a = create_file_reader_agent(llm, "gpt-3.5-turbo", tools=tools_a)
+    agent_b = create_file_reader_agent(llm, "gpt-3.5-turbo", tools=tuple(tools_b))
+    assert agent_a is not agent_b
+    assert len(agent_a.tools) == len(tools_a)
+    assert len(agent_b.tools) == len(tools_b)
+    print("  ✅ Explicit tools are used\n")
+
+
+def run_all_tests():
+    """Run all tests."""
+    try:
+        test_agents_are_isolated()
+        test_explicit_tools_are_used()
+        print("✅ ALL AGENT FACTORY TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
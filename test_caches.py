@@ -0,0 +1,110 @@
+"""
+Cache tests
+Round-trip, expiry and eviction for the exact-match response cache and the
+plan cache (both use in-memory SQLite databases).
+"""
+
+import sys
+from exact_cache import ExactCache, EXACT_CACHE_VERSION
+from plan_cache import PlanCache
+
+
+def _age(cache, table: str, key: str, seconds: int):
+    """Backdate a stored row by the given number of seconds."""
+    cache._conn.execute(f"UPDATE {table} SET ts = ts - ? WHERE key = ?", (seconds, key))
+    cache._conn.commit()
+
+
+def test_exact_cache_round_trip():
+    """Stored answers are replayed for the same request, model and task type."""
+    print("Testing exact cache round-trip...")
+    cache = ExactCache(":memory:")
+    key = cache.make_key("what is a closure?", None, "gpt-4o")
+    
+    assert cache.get(key) is None
+    cache.set(key, "gpt-4o", "A function with captured variables.")
+    assert cache.get(key) == "A function with captured variables."
+    
+    assert cache.make_key("what is a closure?", None, "gpt-4o-mini") != key
+    assert cache.make_key("what is a closure?", "read_file", "gpt-4o") != key
+    print("  ✅ Exact cache round-trip works\n")
+
+
+def test_exact_cache_key_includes_version():
+    """Bumping EXACT_CACHE_VERSION retires every stored answer."""
+    print("Testing exact cache versioned keys...")
+    import exact_cache
+    cache = ExactCache(":memory:")
+    key = cache.make_key("hello", None, "gpt-4o")
+    try:
+        exact_cache.EXACT_CACHE_VERSION = EXACT_CACHE_VERSION + "-next"
+        assert cache.make_key("hello", None, "gpt-4o") != key
+    finally:
+        exact_cache.EXACT_CACHE_VERSION = EXACT_CACHE_VERSION
+    print("  ✅ Keys change with the cache version\n")
+
+
+def test_exact_cache_expiry_and_cap():
+    """Expired answers are not served and only the newest max_rows are kept."""
+    print("Testing exact cache expiry and eviction...")
+    cache = ExactCache(":memory:", ttl=60, max_rows=3)
+    cache.set("old", "m", "stale")
+    _age(cache, "responses", "old", 120)
+    assert cache.get("old") is None, "Expired answer was served"
+    
+    for i in range(5):
+        cache.set(f"k{i}", "m", str(i))
+    rows = [row[0] for row in cache._conn.execute("SELECT key FROM responses ORDER BY key")]
+    assert rows == ["k2", "k3", "k4"], rows
+    print("  ✅ Exact cache expires and evicts\n")
+
+
+def test_plan_cache_round_trip_and_quarantine():
+    """Plans round-trip under normalized requests; quarantined plans are not served."""
+    print("Testing plan cache round-trip...")
+    cache = PlanCache(":memory:")
+    key = cache.make_key("Refactor  the Parser", "code_analysis", ["b", "a"], "gpt-4o")
+    assert key == cache.make_key("refactor the parser", "code_analysis", ["a", "b"], "gpt-4o")
+    
+    cache.set(key, "1. read\n2. refactor")
+    assert cache.get(key) == "1. read\n2. refactor"
+    cache.quarantine(key)
+    assert cache.get(key) is None
+    print("  ✅ Plan cache round-trip and quarantine work\n")
+
+
+def test_plan_cache_expiry_and_cap():
+    """Expired plans are not served and only the newest max_rows are kept."""
+    print("Testing plan cache expiry and eviction...")
+    cache = PlanCache(":memory:", ttl=60, max_rows=2)
+    cache.set("old", "plan")
+    _age(cache, "plans", "old", 120)
+    assert cache.get("old") is None, "Expired plan was served"
+    
+    for i in range(4):
+        cache.set(f"p{i}", f"plan {i}")
+    cache.set("p2", "plan 2 again")  # Rewriting a plan makes it the newest
+    cache.set("p4", "plan 4")
+    rows = [row[0] for row in cache._conn.execute("SELECT key FROM plans ORDER BY key")]
+    assert rows == ["p2", "p4"], rows
+    print("  ✅ Plan cache expires and evicts\n")
+
+
+def run_all_tests():
+    """Run all tests."""
+    try:
+        test_exact_cache_round_trip()
+        test_exact_cache_key_includes_version()
+        test_exact_cache_expiry_and_cap()
+        test_plan_cache_round_trip_and_quarantine()
+        test_plan_cache_expiry_and_cap()
+        print("✅ ALL CACHE TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,75 @@
+"""
+.env parsing tests
+Checks that parse_env_file reads .env files the way python-dotenv's
+load_dotenv does (comments, quotes, escapes, multi-line values).
+"""
+
+import os
+import sys
+import tempfile
+from app import parse_env_file
+
+
+def _parse(text: str) -> dict:
+    """Write text to a temporary .env file and parse it."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, ".env")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return parse_env_file(path, os.stat(path).st_mtime)
+
+
+def test_comments():
+    """Full-line and inline comments are not part of values."""
+    print("Testing .env comments...")
+    values = _parse(
+        "# provider keys\n"
+        "OPENAI_API_KEY=sk-test # personal key\n"
+        "GEMINI_API_KEY='g#1' # quoted hashes are kept\n"
+        "export EXTRA=value\n"
+    )
+    assert values["OPENAI_API_KEY"] == "sk-test", values
+    assert values["GEMINI_API_KEY"] == "g#1", values
+    assert values["EXTRA"] == "value", values
+    print("  ✅ Comments are stripped\n")
+
+
+def test_quotes():
+    """Matching quotes are removed; escapes and multi-line values are honoured."""
+    print("Testing .env quoting...")
+    values = _parse(
+        'DOUBLE="a b"\n'
+        "SINGLE='c d'\n"
+        'ESCAPED="line1\\nline2"\n'
+        'MULTI="first\n'
+        'second"\n'
+        "EMPTY=\n"
+        "NO_VALUE\n"
+    )
+    assert values["DOUBLE"] == "a b"
+    assert values["SINGLE"] == "c d"
+    assert values["ESCAPED"] == "line1\nline2"
+    assert values["MULTI"] == "first\nsecond"
+    assert values["EMPTY"] == ""
+    assert "NO_VALUE" not in values
+    
+    # An unterminated quote is a parse error, not a value with its quotes stripped
+    assert _parse("MISMATCHED=\"e'\n").get("MISMATCHED") != "e", "Mismatched quotes must not be stripped"
+    print("  ✅ Quotes are handled like python-dotenv\n")
+
+
+def run_all_tests():
+    """Run all tests."""
+    try:
+        test_comments()
+        test_quotes()
+        print("✅ ALL .ENV TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
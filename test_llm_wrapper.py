@@ -0,0 +1,103 @@
+"""
+LLM wrapper async tests
+Checks that async LLM calls from any thread or event loop run on the single
+shared LLM loop that owns litellm's pooled AsyncClient.
+"""
+
+import sys
+import asyncio
+import threading
+from types import SimpleNamespace
+import httpx
+import litellm
+from llm_wrapper import LiteLLMWrapper, get_llm_loop, run_on_llm_loop
+
+
+def _fake_acompletion(loops):
+    """Build a litellm.acompletion replacement that records the loop it runs on."""
+    async def acompletion(**params):
+        loops.append(asyncio.get_running_loop())
+        text = params["messages"][-1]["content"]
+        if params.get("stream"):
+            async def chunks():
+                for word in text.split():
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+            return chunks()
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text.upper()))])
+    return acompletion
+
+
+def test_single_llm_loop():
+    """Every thread sees the same LLM loop, which owns the pooled AsyncClient."""
+    print("Testing shared LLM loop...")
+    loops = []
+    threads = [threading.Thread(target=lambda: loops.append(get_llm_loop())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert all(loop is loops[0] for loop in loops), "Threads must share one LLM loop"
+    assert isinstance(litellm.aclient_session, httpx.AsyncClient)
+    print("  ✅ One LLM loop per process\n")
+
+
+def test_async_calls_run_on_llm_loop():
+    """achat/astream_chat/stream_chat hand their requests to the LLM loop."""
+    print("Testing async calls from other loops...")
+    loops = []
+    original = litellm.acompletion
+    litellm.acompletion = _fake_acompletion(loops)
+    try:
+        llm = LiteLLMWrapper(model_name="gpt-3.5-turbo")
+        messages = [{"role": "user", "content": "hello pooled world"}]
+        
+        async def gather_replies():
+            return await asyncio.gather(*(llm.achat(messages) for _ in range(3)))
+        
+        async def stream_reply():
+            return [chunk async for chunk in llm.astream_chat(messages)]
+        
+        # Each asyncio.run builds a new loop, as the batch path and worker threads do
+        assert asyncio.run(gather_replies()) == ["HELLO POOLED WORLD"] * 3
+        assert asyncio.run(stream_reply()) == ["hello", "pooled", "world"]
+        assert list(llm.stream_chat(messages)) == ["hello", "pooled", "world"]
+        assert run_on_llm_loop(llm.achat(messages)) == "HELLO POOLED WORLD"
+    finally:
+        litellm.acompletion = original
+    
+    assert loops and all(loop is get_llm_loop() for loop in loops), "Requests ran outside the LLM loop"
+    print("  ✅ Requests always run on the LLM loop\n")
+
+
+def test_run_on_llm_loop_rejects_reentry():
+    """Blocking on the LLM loop from the LLM loop itself would deadlock."""
+    print("Testing run_on_llm_loop re-entry guard...")
+    
+    async def reenter():
+        try:
+            run_on_llm_loop(asyncio.sleep(0))
+        except RuntimeError:
+            return True
+        return False
+    
+    assert run_on_llm_loop(reenter()), "Re-entry should raise RuntimeError"
+    print("  ✅ Re-entry is rejected\n")
+
+
+def run_all_tests():
+    """Run all tests."""
+    try:
+        test_single_llm_loop()
+        test_async_calls_run_on_llm_loop()
+        test_run_on_llm_loop_rejects_reentry()
+        print("✅ ALL LLM WRAPPER TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
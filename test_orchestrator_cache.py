@@ -0,0 +1,145 @@
+"""
+Orchestrator cache gating tests
+Checks that only direct LLM answers (no task type and no operation type) are
+served from or stored in the response caches; tool-running crews never are.
+"""
+
+import sys
+from types import SimpleNamespace
+import agent_orchestrator
+from agent_orchestrator import AgentOrchestrator
+from exact_cache import ExactCache
+
+
+class RecordingSemanticCache:
+    """Semantic cache that always hits and records every insert."""
+    
+    def __init__(self):
+        self.lookups = []
+        self.inserts = []
+    
+    def lookup(self, request, model_name, threshold=None):
+        self.lookups.append(request)
+        return "stale answer"
+    
+    def insert(self, request, model_name, answer):
+        self.inserts.append(request)
+
+
+def _fake_crewai():
+    """Agent factories and Crew/Task replacements that build nothing heavy."""
+    fake_agents = SimpleNamespace(
+        VERBOSE=False,
+        create_test_agent=lambda llm, model_name, tools=(): SimpleNamespace(role="test"),
+        render_test_agent_prompt=lambda model_name: "system prompt",
+    )
+    fake_crewai = SimpleNamespace(
+        Task=lambda **kwargs: SimpleNamespace(output=None, **kwargs),
+        Crew=lambda **kwargs: SimpleNamespace(**kwargs),
+    )
+    return fake_agents, fake_crewai
+
+
+def _orchestrator():
+    """Orchestrator wired to a recording semantic cache and an in-memory exact cache."""
+    orchestrator = AgentOrchestrator()
+    orchestrator.semantic_cache = RecordingSemanticCache()
+    orchestrator.exact_cache = ExactCache(":memory:")
+    return orchestrator
+
+
+def test_tool_requests_bypass_semantic_cache():
+    """A file operation with no task type runs its crew and is never cached."""
+    print("Testing semantic cache gating for tool requests...")
+    original = agent_orchestrator.agents, agent_orchestrator.crewai
+    agent_orchestrator.agents, agent_orchestrator.crewai = _fake_crewai()
+    try:
+        orchestrator = _orchestrator()
+        # e.g. "rename a.txt to b.txt": an operation type but no matching intent keyword
+        decision = {"task_type": None, "classification": {"operation_type": "file_operation"}, "tools": []}
+        request = "rename a.txt to b.txt"
+        
+        orchestration = orchestrator._single_agent_execution(request, None, "gpt-4o", decision)
+        assert orchestration["orchestration_type"] == "single_agent", "Tool requests must not be replayed"
+        assert orchestrator.semantic_cache.lookups == []
+        
+        orchestrator.record_outcome(orchestration, success=True, result="renamed")
+        assert orchestrator.semantic_cache.inserts == [], "Tool results must not be stored"
+    finally:
+        agent_orchestrator.agents, agent_orchestrator.crewai = original
+    print("  ✅ Tool requests are neither cached nor replayed\n")
+
+
+def test_direct_questions_use_semantic_cache():
+    """Plain questions are looked up, and stored once answered."""
+    print("Testing semantic cache for direct questions...")
+    original = agent_orchestrator.agents, agent_orchestrator.crewai
+    agent_orchestrator.agents, agent_orchestrator.crewai = _fake_crewai()
+    try:
+        orchestrator = _orchestrator()
+        decision = {"task_type": None, "classification": {"operation_type": None}}
+        
+        orchestration = orchestrator._single_agent_execution("what is a closure?", None, "gpt-4o", decision)
+        assert orchestration["orchestration_type"] == "cache"
+        assert orchestration["result"] == "stale answer"
+        
+        orchestrator.semantic_cache.lookup = lambda request, model_name, threshold=None: None
+        orchestration = orchestrator._single_agent_execution("what is a closure?", None, "gpt-4o", decision)
+        assert orchestration["orchestration_type"] == "direct_llm"
+        orchestrator.record_outcome(orchestration, success=True, result="A function with captured variables.")
+        assert orchestrator.semantic_cache.inserts == ["what is a closure?"]
+    finally:
+        agent_orchestrator.agents, agent_orchestrator.crewai = original
+    print("  ✅ Direct questions are cached\n")
+
+
+def test_tool_requests_bypass_exact_cache():
+    """Identical tool requests run their crew every time."""
+    print("Testing exact cache gating for tool requests...")
+    original = agent_orchestrator.agents, agent_orchestrator.crewai
+    agent_orchestrator.agents, agent_orchestrator.crewai = _fake_crewai()
+    try:
+        orchestrator = _orchestrator()
+        decision = {"task_type": None, "classification": {"operation_type": "file_operation"}, "tools": []}
+        request = "move notes.txt into archive/"
+        
+        # Even an answer stored under the request's key is not replayed
+        key = orchestrator.exact_cache.make_key(request, None, "gpt-4o")
+        orchestrator.exact_cache.set(key, "gpt-4o", "moved")
+        
+        orchestration = orchestrator._cached_single_agent_execution(request, None, "gpt-4o", decision)
+        assert orchestration["orchestration_type"] == "single_agent", "Tool requests must not be replayed"
+        assert orchestration["exact_cache_key"] is None
+        
+        orchestrator.exact_cache.clear()
+        orchestrator.record_outcome(orchestration, success=True, result="moved")
+        assert orchestrator.exact_cache.get(key) is None, "Tool results must not be stored"
+        
+        # Plain questions still round-trip through the exact cache
+        direct = {"task_type": None, "classification": {"operation_type": None}}
+        orchestrator.semantic_cache.lookup = lambda request, model_name, threshold=None: None
+        orchestration = orchestrator._cached_single_agent_execution("what is a closure?", None, "gpt-4o", direct)
+        orchestrator.record_outcome(orchestration, success=True, result="A function with captured variables.")
+        orchestration = orchestrator._cached_single_agent_execution("what is a closure?", None, "gpt-4o", direct)
+        assert orchestration["orchestration_type"] == "exact_cache"
+    finally:
+        agent_orchestrator.agents, agent_orchestrator.crewai = original
+    print("  ✅ Tool requests skip the exact cache\n")
+
+
+def run_all_tests():
+    """Run all tests."""
+    try:
+        test_tool_requests_bypass_semantic_cache()
+        test_direct_questions_use_semantic_cache()
+        test_tool_requests_bypass_exact_cache()
+        print("✅ ALL ORCHESTRATOR CACHE TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
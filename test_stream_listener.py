@@ -0,0 +1,93 @@
+"""
+Stream listener tests
+Checks per-request routing of stream events and the bounded chunk queue.
+"""
+
+import sys
+import contextvars
+import threading
+from stream_listener import (
+    StreamRun,
+    StreamlitStreamListener,
+    current_stream_run,
+    coalesce_chunks,
+    STREAM_END,
+    STREAM_QUEUE_SIZE,
+)
+
+
+def test_events_without_context_are_dropped():
+    """Events from threads without current_stream_run belong to no run."""
+    print("Testing routing without a context variable...")
+    listener = StreamlitStreamListener()
+    run = listener.start_run()
+    
+    # A plain thread (like CrewAI's async_execution threads) does not inherit the run
+    seen = []
+    token = current_stream_run.set(run)
+    try:
+        thread = threading.Thread(target=lambda: seen.append(listener._run()))
+        thread.start()
+        thread.join()
+        assert listener._run() is run, "Events in the run's context must reach it"
+    finally:
+        current_stream_run.reset(token)
+    
+    assert seen == [None], "Events outside any run's context must not be routed to a run"
+    assert listener._run() is None, "Starting a run must not make it a process-wide fallback"
+    print("  ✅ Events without a context are dropped\n")
+
+
+def test_copied_context_keeps_routing():
+    """Threads started under a copied context keep routing to their run."""
+    print("Testing routing under a copied context...")
+    listener = StreamlitStreamListener()
+    run = listener.start_run()
+    
+    seen = []
+    token = current_stream_run.set(run)
+    try:
+        ctx = contextvars.copy_context()
+    finally:
+        current_stream_run.reset(token)
+    
+    thread = threading.Thread(target=ctx.run, args=(lambda: seen.append(listener._run()),))
+    thread.start()
+    thread.join()
+    assert seen == [run]
+    print("  ✅ Copied contexts keep their run\n")
+
+
+def test_stream_run_queue():
+    """Non-streaming runs drop chunks; STREAM_END always gets through."""
+    print("Testing StreamRun chunk queue...")
+    silent = StreamRun(stream=False)
+    silent.put_chunk("ignored")
+    assert silent.chunks.empty()
+    
+    run = StreamRun()
+    for i in range(STREAM_QUEUE_SIZE):
+        run.put_chunk(str(i))
+    run.put_chunk(STREAM_END)
+    assert run.chunks.full()
+    text = "".join(coalesce_chunks(run.chunks, interval=0))
+    assert text.endswith(str(STREAM_QUEUE_SIZE - 1))
+    print("  ✅ StreamRun queue behaves\n")
+
+
+def run_all_tests():
+    """Run all tests."""
+    try:
+        test_events_without_context_are_dropped()
+        test_copied_context_keeps_routing()
+        test_stream_run_queue()
+        print("✅ ALL STREAM LISTENER TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
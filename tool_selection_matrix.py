@@ -3,6 +3,7 @@ Tool Selection Matrix - Maps tasks to appropriate tools
 Implements Appendix C of Claude Code Comprehensive Logic Plan
 """
 
+import threading
 from typing import Dict, List, Any, Optional
 from tools_registry import get_tool_set, get_tools_by_category
 from langchain_community.tools import ShellTool
@@ -255,13 +256,16 @@ class ToolSelectionMatrix:
         return self.TASK_TOOL_MAP[task_type]
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _tool_matrix = None
+_tool_matrix_lock = threading.Lock()
 
 def get_tool_matrix() -> ToolSelectionMatrix:
     """Get or create the global tool selection matrix instance."""
     global _tool_matrix
     if _tool_matrix is None:
-        _tool_matrix = ToolSelectionMatrix()
+        with _tool_matrix_lock:
+            if _tool_matrix is None:
+                _tool_matrix = ToolSelectionMatrix()
     return _tool_matrix
 
@@ -5,6 +5,7 @@ Uses COT (Chain of Thought) reasoning to match prompts to appropriate tools.
 
 from typing import List, Dict, Any, Optional
 import re
+import threading
 from tools_registry import (
     get_tool_set,
     get_tools_by_category,
@@ -198,13 +199,16 @@ class ToolSelector:
         return "comprehensive"
 
 
-# Global instance
+# Global instance - built once; the lock is only taken while building it
 _tool_selector = None
+_tool_selector_lock = threading.Lock()
 
 def get_tool_selector() -> ToolSelector:
     """Get or create the global tool selector instance."""
     global _tool_selector
     if _tool_selector is None:
-        _tool_selector = ToolSelector()
+        with _tool_selector_lock:
+            if _tool_selector is None:
+                _tool_selector = ToolSelector()
     return _tool_selector
 